@@ -0,0 +1,349 @@
+# Multi-session load test for uic/pp.py. Starts the dashboard with
+# `streamlit run` on a local port, then for each concurrency level opens that
+# many websocket sessions speaking Streamlit's own protocol, and has each one
+# replay a random mix of interactions (navigation, chart changes, filters,
+# search, theme toggles, animation demos) with think time in between.
+# Reports throughput, p50/p95/p99 latency and server RSS per level, so
+# replica sizing can be based on measurements:
+#
+#   python benchmarks/load_test.py --sessions 1 4 16 32 --duration 30
+#
+# Lottie animations are seeded into a fresh cache directory from the bundled
+# ani.json, so the server makes no network requests. Fragment auto-reruns
+# (progress bars) are not replayed; a demo's background task still runs.
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+
+import numpy as np
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from websockets.sync.client import connect
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(REPO_DIR, "uic")
+SCRIPT = os.path.join(APP_DIR, "pp.py")
+PORT = 8599
+SESSIONS = (1, 4, 16, 32)
+DURATION = 30
+THINK_TIME = 0.5
+ROWS = 10_000
+STARTUP_TIMEOUT = 60
+RUN_TIMEOUT = 120
+RSS_INTERVAL = 0.5
+
+PAGES = ["Home", "Data Explorer", "Visualizations", "About"]
+NAVIGATION = "streamlit_option_menu.option_menu"
+# Relative frequency of each interaction in the replayed mix
+ACTION_WEIGHTS = {
+    "navigate": 3,
+    "chart": 3,
+    "filter": 2,
+    "search": 1,
+    "theme": 1,
+    "demo": 1,
+}
+SEARCH_TERMS = ["nor", "sou", "a", "west", ""]
+FINISHED = {
+    ForwardMsg.FINISHED_SUCCESSFULLY,
+    ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY,
+    ForwardMsg.FINISHED_WITH_COMPILE_ERROR,
+}
+
+
+def seed_lottie_cache(cache_dir):
+    sys.path.insert(0, APP_DIR)
+    from common import LOTTIE_URLS
+    from lottie_cache import LottieCache
+
+    cache = LottieCache(cache_dir=cache_dir)
+    for url in LOTTIE_URLS:
+        cache.seed(url, os.path.join(REPO_DIR, "ani.json"), fresh=True)
+
+
+def start_server(port, rows):
+    cache_dir = tempfile.mkdtemp(prefix="load-lottie-")
+    seed_lottie_cache(cache_dir)
+    env = dict(os.environ, DASHBOARD_ROWS=str(rows), LOTTIE_CACHE_DIR=cache_dir)
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", SCRIPT,
+            "--server.headless", "true",
+            "--server.port", str(port),
+            "--browser.gatherUsageStats", "false",
+        ],
+        cwd=REPO_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return server
+        except OSError:
+            if server.poll() is not None:
+                raise RuntimeError("The dashboard exited during startup")
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"The dashboard did not start within {STARTUP_TIMEOUT} s")
+
+
+def rss_bytes(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+# Samples the server's resident set size in the background
+class RssSampler:
+    def __init__(self, pid):
+        self.pid = pid
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(RSS_INTERVAL):
+            self.samples.append(rss_bytes(self.pid))
+
+    def __enter__(self):
+        self.samples.append(rss_bytes(self.pid))
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.samples.append(rss_bytes(self.pid))
+
+
+# A widget's value as rendered by the server, in the form _set compares it
+def current_value(kind, widget, options):
+    if kind == "text_input":
+        return widget.value if widget.set_value else widget.default
+    if kind == "selectbox":
+        return widget.raw_value if widget.set_value else options[widget.default] if options else None
+    if kind == "multiselect":
+        return list(widget.raw_values) if widget.set_value else [options[i] for i in widget.default]
+    return None
+
+
+# One browser session: keeps the widgets the server has rendered and the
+# values this user has set, and sends reruns the way the frontend does
+class SimulatedUser:
+    def __init__(self, ws, seed):
+        self.ws = ws
+        self.rng = random.Random(seed)
+        self.widgets = {}
+        self.states = {}
+        self.values = {NAVIGATION: json.dumps("Home")}
+        self.page = "Home"
+
+    def _record_widget(self, msg):
+        element = msg.delta.new_element
+        kind = element.WhichOneof("type")
+        widget = getattr(element, kind)
+        widget_id = getattr(widget, "id", "")
+        if not widget_id:
+            return
+        label = widget.component_name if kind == "component_instance" else getattr(widget, "label", "")
+        options = list(getattr(widget, "options", []))
+        self.widgets[label] = (kind, widget_id, msg.delta.fragment_id, options)
+        if label not in self.values:
+            self.values[label] = current_value(kind, widget, options)
+
+    # Send a rerun with the user's widget values plus changed (a WidgetState
+    # for this run only, e.g. a button trigger) and wait until the script
+    # run it causes has finished. Returns (seconds, bytes received, errors).
+    def rerun(self, changed=None, fragment_id=""):
+        back = BackMsg()
+        back.rerun_script.fragment_id = fragment_id
+        states = dict(self.states)
+        if changed is not None:
+            states[changed.id] = changed
+            if not changed.HasField("trigger_value"):
+                self.states[changed.id] = changed
+        back.rerun_script.widget_states.widgets.extend(states.values())
+
+        received = errors = 0
+        start = time.perf_counter()
+        self.ws.send(back.SerializeToString())
+        while True:
+            data = self.ws.recv(timeout=RUN_TIMEOUT)
+            received += len(data)
+            msg = ForwardMsg()
+            msg.ParseFromString(data)
+            kind = msg.WhichOneof("type")
+            if kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                if msg.delta.new_element.WhichOneof("type") == "exception":
+                    errors += 1
+                self._record_widget(msg)
+            elif kind == "script_finished" and msg.script_finished in FINISHED:
+                return time.perf_counter() - start, received, errors
+
+    # Set the widget labelled label to value and rerun. Like the frontend,
+    # sends nothing when the value is unchanged (returns None); the server
+    # would not finish a run for it.
+    def _set(self, label, field, value):
+        kind, widget_id, fragment_id, options = self.widgets[label]
+        if field != "trigger_value":
+            if self.values.get(label) == value:
+                return None
+            self.values[label] = value
+        state = WidgetState(id=widget_id)
+        if field == "string_array_value":
+            state.string_array_value.data.extend(value)
+        else:
+            setattr(state, field, value)
+        return self.rerun(state, fragment_id)
+
+    def _options(self, label):
+        return self.widgets[label][3]
+
+    def navigate(self, page=None):
+        self.page = page or self.rng.choice([p for p in PAGES if p != self.page])
+        return self._set(NAVIGATION, "json_value", json.dumps(self.page))
+
+    def _on_page(self, page, timings):
+        if self.page != page:
+            timings.append(("navigate", self.navigate(page)))
+
+    # Run one interaction from the mix; returns [(action, (seconds, bytes, errors))]
+    def act(self):
+        action = self.rng.choices(list(ACTION_WEIGHTS), weights=list(ACTION_WEIGHTS.values()))[0]
+        timings = []
+        if action == "navigate":
+            timings.append((action, self.navigate()))
+        elif action == "chart":
+            self._on_page("Visualizations", timings)
+            label = "Select Visualization Type"
+            timings.append((action, self._set(label, "string_value", self.rng.choice(self._options(label)))))
+        elif action == "filter":
+            self._on_page("Data Explorer", timings)
+            label = self.rng.choice(["Select Regions", "Select Categories"])
+            options = self._options(label)
+            chosen = self.rng.sample(options, self.rng.randint(1, len(options)))
+            timings.append((action, self._set(label, "string_array_value", chosen)))
+        elif action == "search":
+            self._on_page("Data Explorer", timings)
+            timings.append((action, self._set("Search", "string_value", self.rng.choice(SEARCH_TERMS))))
+        elif action == "theme":
+            timings.append((action, self._set("🔄 Toggle", "trigger_value", True)))
+        elif action == "demo":
+            self._on_page("Home", timings)
+            timings.append((action, self._set("Show Animation Demo", "trigger_value", True)))
+        return [(name, timing) for name, timing in timings if timing is not None]
+
+
+def run_user(url, seed, deadline, think_time, results, lock):
+    samples = []
+    error = None
+    try:
+        with connect(url, subprotocols=["streamlit"], max_size=None) as ws:
+            user = SimulatedUser(ws, seed)
+            samples.append(("connect", user.rerun()))
+            while time.monotonic() < deadline:
+                samples.extend(user.act())
+                time.sleep(user.rng.expovariate(1 / think_time) if think_time > 0 else 0)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    with lock:
+        results["samples"].extend(samples)
+        if error is not None:
+            results["errors"].append(error)
+
+
+# Run `sessions` simulated users for duration seconds; returns the level's
+# summary
+def run_level(port, sessions, duration, think_time, server_pid):
+    url = f"ws://127.0.0.1:{port}/_stcore/stream"
+    results = {"samples": [], "errors": []}
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+    threads = [
+        threading.Thread(target=run_user, args=(url, i, deadline, think_time, results, lock))
+        for i in range(sessions)
+    ]
+    with RssSampler(server_pid) as rss:
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - start
+
+    interactions = [s for name, s in results["samples"] if name != "connect"]
+    latencies = np.array([seconds * 1000 for seconds, _, _ in interactions] or [np.nan])
+    by_action = defaultdict(list)
+    for name, (seconds, _, _) in results["samples"]:
+        by_action[name].append(seconds * 1000)
+    return {
+        "sessions": sessions,
+        "interactions": len(interactions),
+        "throughput": len(interactions) / elapsed,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "bytes_per_interaction": float(np.mean([b for _, b, _ in interactions])) if interactions else 0.0,
+        "script_errors": sum(e for _, _, e in interactions),
+        "failed_sessions": len(results["errors"]),
+        "session_errors": sorted(set(results["errors"])),
+        "rss_start_mb": rss.samples[0] / 2**20,
+        "rss_max_mb": max(rss.samples) / 2**20,
+        "rss_end_mb": rss.samples[-1] / 2**20,
+        "p95_ms_by_action": {name: float(np.percentile(v, 95)) for name, v in sorted(by_action.items())},
+    }
+
+
+def print_level(level):
+    print(
+        f"{level['sessions']:>8} {level['interactions']:>12} {level['throughput']:>10.1f} "
+        f"{level['p50_ms']:>8.0f} {level['p95_ms']:>8.0f} {level['p99_ms']:>8.0f} "
+        f"{level['rss_max_mb']:>9.0f} {level['rss_end_mb']:>9.0f} {level['script_errors'] + level['failed_sessions']:>7}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the dashboard with concurrent sessions")
+    parser.add_argument("--sessions", type=int, nargs="+", default=SESSIONS, help="concurrency levels")
+    parser.add_argument("--duration", type=float, default=DURATION, help="seconds per level")
+    parser.add_argument("--think-time", type=float, default=THINK_TIME, help="mean pause between interactions")
+    parser.add_argument("--rows", type=int, default=ROWS, help="dataset size")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--output", help="also write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    server = start_server(args.port, args.rows)
+    levels = []
+    try:
+        print(f"{args.rows:,} rows, {args.duration:g} s per level, {args.think_time:g} s mean think time")
+        print(f"{'sessions':>8} {'interactions':>12} {'per sec':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+              f"{'RSS max':>9} {'RSS end':>9} {'errors':>7}")
+        for sessions in args.sessions:
+            level = run_level(args.port, sessions, args.duration, args.think_time, server.pid)
+            levels.append(level)
+            print_level(level)
+            for error in level["session_errors"]:
+                print(f"         session failed: {error}")
+    finally:
+        server.terminate()
+        server.wait()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"rows": args.rows, "duration": args.duration, "think_time": args.think_time, "levels": levels}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+# Rerun latency benchmark for uic/pp.py. Drives the app headlessly with
+# Streamlit's AppTest through a scripted session: every page, every
+# Visualizations selectbox, the Data Explorer filters, search and sort, and
+# the theme toggle. Each data size runs in its own worker process (fresh
+# caches, DASHBOARD_ROWS set) and the session is repeated --repeat times.
+# Reports p50/p95 rerun time and delta payload bytes per step.
+#
+#   python benchmarks/rerun_latency.py                  # report
+#   python benchmarks/rerun_latency.py --save           # write the baseline
+#   python benchmarks/rerun_latency.py --compare        # fail on regressions
+#
+# Lottie fetches are stubbed with the bundled ani.json, and option_menu,
+# a custom component AppTest cannot drive, is replaced by an st.radio.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from collections import defaultdict
+
+import numpy as np
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(REPO_DIR, "uic")
+SCRIPT = os.path.join(APP_DIR, "pp.py")
+BASELINE = os.path.join(REPO_DIR, "benchmarks", "baselines", "rerun_latency.json")
+SIZES = (100, 1_000, 10_000, 50_000)
+REPEAT = 5
+TIMEOUT = 120
+# A step regresses when its p50 time grows by this factor and by at least
+# MIN_REGRESSION_MS, or its p50 payload by this factor
+REGRESSION_FACTOR = 1.5
+MIN_REGRESSION_MS = 20
+NAVIGATION_KEY = "bench_navigation"
+
+
+def stub_option_menu():
+    import streamlit as st
+
+    def option_menu(menu_title, options, default_index=0, **kwargs):
+        return st.radio(menu_title, options, index=default_index, key=NAVIGATION_KEY)
+
+    module = types.ModuleType("streamlit_option_menu")
+    module.option_menu = option_menu
+    sys.modules["streamlit_option_menu"] = module
+
+
+# Serve every Lottie URL from the bundled animation instead of the network
+def stub_lottie_fetches():
+    os.environ["LOTTIE_CACHE_DIR"] = tempfile.mkdtemp(prefix="bench-lottie-")
+    sys.path.insert(0, APP_DIR)
+    from lottie_cache import LottieCache
+
+    with open(os.path.join(REPO_DIR, "ani.json")) as f:
+        animation = json.load(f)
+
+    def revalidate(self, url, entry):
+        return self._store(url, {
+            "url": url,
+            "etag": None,
+            "last_modified": None,
+            "fetched_at": time.time(),
+            "data": animation,
+        })
+
+    LottieCache._revalidate = revalidate
+
+
+# Count the bytes of every ForwardMsg the script enqueues
+class PayloadCounter:
+    def __init__(self):
+        from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+
+        self.bytes = 0
+        enqueue = ForwardMsgQueue.enqueue
+
+        def counting_enqueue(queue, msg):
+            self.bytes += msg.ByteSize()
+            return enqueue(queue, msg)
+
+        ForwardMsgQueue.enqueue = counting_enqueue
+
+
+class Session:
+    def __init__(self, at, payload):
+        self.at = at
+        self.payload = payload
+        self.samples = defaultdict(list)
+
+    def step(self, name, action=None):
+        if action is not None:
+            action()
+        self.payload.bytes = 0
+        start = time.perf_counter()
+        self.at.run()
+        elapsed = (time.perf_counter() - start) * 1000
+        if self.at.exception:
+            raise RuntimeError(f"{name}: {self.at.exception[0].message}")
+        self.samples[name].append((elapsed, self.payload.bytes))
+
+    def widget(self, kind, label):
+        for widget in getattr(self.at, kind):
+            if widget.label == label:
+                return widget
+        raise LookupError(f"No {kind} labelled {label!r}")
+
+    def navigate(self, page):
+        self.step(f"page {page}", lambda: self.at.radio(key=NAVIGATION_KEY).set_value(page))
+
+    def toggle_theme(self, page):
+        self.step(f"theme {page}", lambda: self.widget("button", "🔄 Toggle").click())
+
+
+VIZ_TYPE_LABEL = "Select Visualization Type"
+
+
+def visualizations(session):
+    session.navigate("Visualizations")
+    viz_types = session.widget("selectbox", VIZ_TYPE_LABEL).options
+    for viz_type in viz_types:
+        session.step(f"viz {viz_type}", lambda: session.widget("selectbox", VIZ_TYPE_LABEL).set_value(viz_type))
+        labels = [box.label for box in session.at.selectbox if box.label != VIZ_TYPE_LABEL]
+        for label in labels:
+            # Every other option, then back to the default
+            options = session.widget("selectbox", label).options
+            for option in options[1:] + options[:1]:
+                session.step(f"viz {viz_type} / {label}", lambda: session.widget("selectbox", label).set_value(option))
+
+
+def data_explorer(session):
+    session.navigate("Data Explorer")
+    regions = session.widget("multiselect", "Select Regions")
+    session.step("explorer regions", lambda: regions.set_value(regions.value[:2]))
+    categories = session.widget("multiselect", "Select Categories")
+    session.step("explorer categories", lambda: categories.set_value(categories.value[:3]))
+    dates = session.widget("date_input", "Select Date Range")
+    start, end = dates.value
+    session.step("explorer dates", lambda: dates.set_value((start, start + (end - start) / 2)))
+    session.step("explorer search", lambda: session.widget("text_input", "Search").input("nor"))
+    session.step("explorer sort", lambda: session.widget("selectbox", "Sort by").set_value("sales"))
+    session.step("explorer order", lambda: session.widget("selectbox", "Order").set_value("Descending"))
+
+
+def scripted_session(session):
+    session.step("first run")
+    for page in ("Data Explorer", "Visualizations", "About", "Home"):
+        session.navigate(page)
+    session.toggle_theme("Home")
+    session.navigate("About")
+    session.toggle_theme("About")
+    visualizations(session)
+    data_explorer(session)
+
+
+# Worker: run the scripted session repeat times against one data size and
+# print the samples as JSON
+def run_worker(repeat):
+    stub_option_menu()
+    stub_lottie_fetches()
+    payload = PayloadCounter()
+
+    from streamlit.testing.v1 import AppTest
+
+    samples = defaultdict(list)
+    for _ in range(repeat):
+        session = Session(AppTest.from_file(SCRIPT, default_timeout=TIMEOUT), payload)
+        scripted_session(session)
+        for name, values in session.samples.items():
+            samples[name].extend(values)
+    print(json.dumps(samples))
+
+
+def measure(rows, repeat):
+    env = dict(os.environ, DASHBOARD_ROWS=str(rows))
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", "--repeat", str(repeat)],
+        cwd=REPO_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Worker for {rows} rows failed:\n{result.stderr}")
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def summarize(samples):
+    summary = {}
+    for name, values in samples.items():
+        times = np.array([t for t, _ in values])
+        sizes = np.array([b for _, b in values])
+        summary[name] = {
+            "runs": len(values),
+            "p50_ms": round(float(np.percentile(times, 50)), 2),
+            "p95_ms": round(float(np.percentile(times, 95)), 2),
+            "p50_bytes": int(np.percentile(sizes, 50)),
+        }
+    return summary
+
+
+def print_summary(rows, summary):
+    print(f"\n{rows:,} rows")
+    print(f"  {'step':<48} {'runs':>5} {'p50 ms':>9} {'p95 ms':>9} {'p50 bytes':>11}")
+    for name, stats in summary.items():
+        print(f"  {name:<48} {stats['runs']:>5} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['p50_bytes']:>11,}")
+
+
+# Steps slower or larger than the baseline beyond the regression thresholds
+def regressions(results, baseline):
+    found = []
+    for rows, summary in results.items():
+        for name, stats in summary.items():
+            before = baseline.get(rows, {}).get(name)
+            if before is None:
+                continue
+            slower = stats["p50_ms"] - before["p50_ms"]
+            if stats["p50_ms"] > before["p50_ms"] * REGRESSION_FACTOR and slower >= MIN_REGRESSION_MS:
+                found.append(f"{rows} rows, {name}: p50 {before['p50_ms']:.1f} -> {stats['p50_ms']:.1f} ms")
+            if stats["p50_bytes"] > before["p50_bytes"] * REGRESSION_FACTOR:
+                found.append(f"{rows} rows, {name}: payload {before['p50_bytes']:,} -> {stats['p50_bytes']:,} bytes")
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dashboard rerun latency and payload size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="dataset sizes in rows")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="scripted sessions per size")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline file")
+    parser.add_argument("--save", action="store_true", help="save the results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="exit 1 when a step regressed against the baseline")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_worker(args.repeat)
+        return 0
+
+    results = {}
+    for rows in args.sizes:
+        results[str(rows)] = summarize(measure(rows, args.repeat))
+        print_summary(rows, results[str(rows)])
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved baseline to {args.baseline}")
+
+    if args.compare:
+        with open(args.baseline) as f:
+            found = regressions(results, json.load(f))
+        for line in found:
+            print(f"REGRESSION {line}")
+        return 1 if found else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,30 @@
+# The dashboard modules import each other by their flat names, as under
+# `streamlit run uic/pp.py`
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "uic"))
+
+REGIONS = ["North", "South", "East", "West"]
+CATEGORIES = ["Electronics", "Clothing", "Food", "Books"]
+
+
+# Frames shaped like the dashboard dataset: rows at random times, on average
+# spacing apart, from start on, with categorical region and category
+@pytest.fixture
+def make_frame():
+    def make(rows, seed=0, start="2024-01-01", spacing="30min", regions=REGIONS, categories=CATEGORIES):
+        rng = np.random.default_rng(seed)
+        offsets = np.sort(rng.uniform(0, rows * pd.Timedelta(spacing).value, rows)).astype(np.int64)
+        return pd.DataFrame({
+            "date": pd.Timestamp(start) + pd.to_timedelta(offsets),
+            "region": pd.Categorical(rng.choice(regions, rows)),
+            "category": pd.Categorical(rng.choice(categories, rows)),
+            "sales": rng.normal(500, 150, rows).round(2),
+            "customers": rng.integers(1, 100, rows),
+        })
+    return make
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from agg_cube import AGGREGATES, AggregateCube
+
+
+def assert_series_matches(actual, expected):
+    pd.testing.assert_series_equal(
+        actual.astype(np.float64), expected.astype(np.float64),
+        check_exact=False, rtol=1e-6, check_index_type=False, check_names=False,
+    )
+
+
+# One region x category cell with a single row, whose var and std are NaN
+@pytest.fixture
+def df(make_frame):
+    df = make_frame(2000)
+    single = df.iloc[[0]].assign(region="Central", category="Toys")
+    return pd.concat([df.astype({"region": str, "category": str}), single], ignore_index=True).astype(
+        {"region": "category", "category": "category"}
+    )
+
+
+@pytest.mark.parametrize("agg", AGGREGATES)
+@pytest.mark.parametrize("by", ["region", "category"])
+def test_total_matches_groupby(df, by, agg):
+    cube = AggregateCube(df)
+    for measure in ("sales", "customers"):
+        expected = df.groupby(by, observed=True)[measure].agg(agg)
+        expected.index = expected.index.astype(object)
+        assert_series_matches(cube.total(by, measure, agg), expected)
+
+
+@pytest.mark.parametrize("agg", AGGREGATES)
+def test_pivot_matches_pivot_table(df, agg):
+    cube = AggregateCube(df, daily=True)
+    expected = pd.pivot_table(df, values="sales", index="region", columns="category", aggfunc=agg, observed=True)
+    expected.index = expected.index.astype(object)
+    expected.columns = expected.columns.astype(object)
+    pd.testing.assert_frame_equal(
+        cube.pivot("region", "category", "sales", agg), expected.astype(np.float64),
+        check_exact=False, rtol=1e-6, check_index_type=False, check_column_type=False,
+    )
+
+
+def test_pivot_of_one_dimension_is_diagonal(df):
+    table = AggregateCube(df).pivot("region", "region", "sales", "mean")
+    expected = df.groupby("region", observed=True)["sales"].mean()
+    assert_series_matches(pd.Series(np.diag(table), index=table.index), expected.set_axis(expected.index.astype(object)))
+    assert table.where(~np.eye(len(table), dtype=bool)).isna().all().all()
+
+
+# Appended batches bring categoricals with other categories, including
+# values the cube has not seen yet
+def test_appends_match_cube_of_all_rows(df):
+    cube = AggregateCube(df.iloc[:500], daily=True)
+    for lo, hi in [(500, 501), (501, 900), (900, len(df))]:
+        batch = df.iloc[lo:hi].copy()
+        for column in ("region", "category"):
+            batch[column] = batch[column].cat.remove_unused_categories()
+        cube.append(batch)
+
+    assert cube.rows == len(df)
+    assert sorted(cube.distinct("region")) == sorted(df["region"].unique())
+    for agg in AGGREGATES:
+        expected = df.groupby("region", observed=True)["sales"].agg(agg)
+        assert_series_matches(cube.total("region", "sales", agg), expected.set_axis(expected.index.astype(object)))
+    pd.testing.assert_frame_equal(
+        cube.pivot("region", "category", "customers", "std"),
+        AggregateCube(df, daily=True).pivot("region", "category", "customers", "std"),
+        check_exact=False, rtol=1e-9,
+    )
+
+
+def test_unknown_aggregate(df):
+    with pytest.raises(ValueError):
+        AggregateCube(df).total("region", "sales", "median")
@@ -0,0 +1,52 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from data_source import FileSource, filter_frame, write_source
+
+DATE_RANGES = [
+    ("2024-01-03", "2024-01-05"),
+    (datetime.date(2024, 1, 3), datetime.date(2024, 1, 3)),
+    (None, "2024-01-02"),
+    ("2024-01-06 15:00", None),
+]
+
+
+# Rows on the days from start to end, both inclusive, whatever their time
+def expected_rows(df, date_range, values=None):
+    days = df["date"].dt.floor("D")
+    start, end = date_range
+    mask = pd.Series(True, index=df.index)
+    if start is not None:
+        mask &= days >= pd.Timestamp(start).floor("D")
+    if end is not None:
+        mask &= days <= pd.Timestamp(end).floor("D")
+    for column, allowed in (values or {}).items():
+        mask &= df[column].isin(allowed)
+    return df[mask].reset_index(drop=True)
+
+
+@pytest.fixture
+def df(make_frame):
+    return make_frame(200, spacing="1h").astype({"region": str, "category": str})
+
+
+@pytest.mark.parametrize("date_range", DATE_RANGES)
+def test_filter_frame_keeps_whole_end_day(df, date_range):
+    filtered = filter_frame(df, date_range)
+    pd.testing.assert_frame_equal(filtered, expected_rows(df, date_range))
+    if date_range[1] is not None:
+        assert (filtered["date"].dt.floor("D") == pd.Timestamp(date_range[1])).any()
+        assert filtered["date"].max().hour > 0
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".arrow"])
+@pytest.mark.parametrize("date_range", DATE_RANGES)
+def test_file_source_keeps_whole_end_day(df, tmp_path, suffix, date_range):
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"history{suffix}")
+    write_source(df, path, row_group_rows=24)
+    values = {"region": ["North", "East"]}
+    loaded = FileSource(path).load(date_range=date_range, values=values)
+    pd.testing.assert_frame_equal(loaded, expected_rows(df, date_range, values), check_dtype=False)
@@ -0,0 +1,46 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from streamlit.elements.widgets.button import convert_data_to_bytes_and_infer_mime
+
+from export import available_formats, download_data, write_export
+
+READERS = {
+    "CSV": lambda data: pd.read_csv(io.BytesIO(data), parse_dates=["date"]),
+    "Parquet": lambda data: pd.read_parquet(io.BytesIO(data)),
+    "Arrow IPC": lambda data: pd.read_feather(io.BytesIO(data)),
+}
+
+
+# What st.download_button does with the value a data callable returns
+def downloaded(value):
+    data, _ = convert_data_to_bytes_and_infer_mime(value, unsupported_error=TypeError(type(value)))
+    return data
+
+
+@pytest.mark.parametrize("fmt", available_formats())
+@pytest.mark.parametrize("spool_bytes", [None, 1])
+def test_export_downloads(make_frame, monkeypatch, fmt, spool_bytes):
+    if spool_bytes is not None:
+        # Spilled to disk instead of kept in memory
+        monkeypatch.setattr("export.SPOOL_BYTES", spool_bytes)
+    df = make_frame(250)
+    positions = np.arange(3, 250, 2)
+    f = write_export(df, positions, fmt, chunk_rows=40)
+
+    for _ in range(2):
+        exported = READERS[fmt](downloaded(download_data(f)))
+        expected = df.iloc[positions].reset_index(drop=True)
+        pd.testing.assert_frame_equal(
+            exported, expected, check_dtype=False, check_categorical=False, check_exact=False,
+        )
+
+
+@pytest.mark.parametrize("fmt", available_formats())
+def test_empty_selection_keeps_columns(make_frame, fmt):
+    df = make_frame(10)
+    exported = READERS[fmt](downloaded(download_data(write_export(df, np.arange(0), fmt))))
+    assert list(exported.columns) == list(df.columns)
+    assert len(exported) == 0
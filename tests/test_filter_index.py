@@ -0,0 +1,70 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from filter_index import FilterIndex
+
+DATE_RANGES = [
+    None,
+    (datetime.date(2024, 1, 3), datetime.date(2024, 1, 9)),
+    (datetime.date(2024, 1, 5),),
+    (datetime.date(2023, 6, 1), datetime.date(2024, 1, 2)),
+    (datetime.date(2024, 3, 1), datetime.date(2024, 4, 1)),
+]
+SELECTIONS = [
+    None,
+    {"region": ["North", "South", "East", "West"], "category": ["Food"]},
+    {"region": ["East"], "category": ["Books", "Clothing"]},
+    {"region": ["West", "Nowhere"]},
+    {"region": [], "category": ["Food"]},
+]
+
+
+# Row positions matching the filter, with a plain boolean mask
+def expected_positions(df, date_range, selections):
+    mask = pd.Series(True, index=df.index)
+    if date_range:
+        days = df["date"].dt.floor("D")
+        mask &= (days >= pd.Timestamp(date_range[0])) & (days <= pd.Timestamp(date_range[-1]))
+    for column, selected in (selections or {}).items():
+        mask &= df[column].isin(selected)
+    return np.flatnonzero(mask.to_numpy())
+
+
+# Live appends can bring rows older than the last one, which leaves the
+# dates unsorted
+@pytest.fixture(params=["sorted", "appended", "shuffled"])
+def df(request, make_frame):
+    df = make_frame(1001, spacing="17min")
+    if request.param == "appended":
+        late = make_frame(203, seed=1, start="2024-01-04", spacing="9min")
+        return pd.concat([df, late], ignore_index=True)
+    if request.param == "shuffled":
+        return df.sample(frac=1, random_state=0).reset_index(drop=True)
+    return df
+
+
+@pytest.mark.parametrize("date_range", DATE_RANGES)
+@pytest.mark.parametrize("selections", SELECTIONS)
+def test_positions_match_mask(df, date_range, selections):
+    positions = FilterIndex(df).positions(date_range, selections)
+    assert positions.dtype == np.int64
+    np.testing.assert_array_equal(positions, expected_positions(df, date_range, selections))
+
+
+def test_date_bounds_and_values(df):
+    index = FilterIndex(df)
+    assert index.date_bounds() == (df["date"].min().date(), df["date"].max().date())
+    assert index.values("region") == sorted(df["region"].unique())
+
+
+def test_equivalent_filters_share_a_key(df):
+    index = FilterIndex(df)
+    first, last = index.date_bounds()
+    every = {"region": index.values("region")}
+    wide = (first - datetime.timedelta(days=30), last + datetime.timedelta(days=30))
+    assert index.filter_key(wide, every) == index.filter_key(None, {"region": reversed(index.values("region"))})
+    assert index.filter_key(None, {"region": ["West", "Nowhere"]}) == index.filter_key(None, {"region": ["West"]})
+    assert index.filter_key((last + datetime.timedelta(days=1), last + datetime.timedelta(days=2))) == ("empty",)
@@ -0,0 +1,129 @@
+import json
+import time
+
+import pytest
+import requests
+
+import lottie_cache
+from lottie_cache import FAILURE_BACKOFF, LottieCache
+
+URL = "https://example.com/animation.json"
+ANIMATION = {"v": "5.5.7", "layers": []}
+
+
+class Response:
+    def __init__(self, status_code, data=None, headers=None):
+        self.status_code = status_code
+        self.data = data
+        self.headers = headers or {}
+
+    def json(self):
+        return self.data
+
+
+class Clock:
+    def __init__(self):
+        self.now = time.time()
+
+    def time(self):
+        return self.now
+
+
+# Origin answering with the queued responses (the last one repeats) and
+# counting its requests
+class Origin:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, headers=None, timeout=None):
+        self.calls += 1
+        response = self.responses[0] if len(self.responses) == 1 else self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(lottie_cache, "time", clock)
+    return clock
+
+
+def serve(monkeypatch, *responses):
+    origin = Origin(*responses)
+    monkeypatch.setattr(requests, "get", origin.get)
+    return origin
+
+
+def settle(cache):
+    while cache._inflight:
+        time.sleep(0.01)
+
+
+def test_failed_url_is_not_refetched_until_backoff_passes(tmp_path, monkeypatch, clock):
+    origin = serve(monkeypatch, Response(503), Response(200, ANIMATION))
+    cache = LottieCache(cache_dir=str(tmp_path))
+    for _ in range(5):
+        assert cache.submit(URL).result() is None
+    assert origin.calls == 1
+
+    clock.now += FAILURE_BACKOFF + 1
+    assert cache.submit(URL).result() == ANIMATION
+    assert origin.calls == 2
+
+
+def test_network_error_starts_a_backoff(tmp_path, monkeypatch, clock):
+    origin = serve(monkeypatch, requests.ConnectionError("down"))
+    cache = LottieCache(cache_dir=str(tmp_path))
+    with pytest.raises(requests.ConnectionError):
+        cache.get(URL)
+    assert cache.get(URL) is None
+    assert origin.calls == 1
+
+    # Each further failure doubles the backoff
+    clock.now += FAILURE_BACKOFF + 1
+    with pytest.raises(requests.ConnectionError):
+        cache.get(URL)
+    clock.now += FAILURE_BACKOFF + 1
+    assert cache.get(URL) is None
+    assert origin.calls == 2
+
+
+def test_retry_after_is_honored(tmp_path, monkeypatch, clock):
+    origin = serve(monkeypatch, Response(429, headers={"Retry-After": "600"}))
+    cache = LottieCache(cache_dir=str(tmp_path))
+    cache.get(URL)
+    clock.now += 599
+    cache.get(URL)
+    assert origin.calls == 1
+    clock.now += 2
+    cache.get(URL)
+    assert origin.calls == 2
+
+
+# A stale seed is served while the origin is down, revalidated once per backoff
+def test_stale_seed_revalidates_once_while_origin_is_down(tmp_path, monkeypatch, clock):
+    seed = tmp_path / "seed.json"
+    seed.write_text(json.dumps(ANIMATION))
+    origin = serve(monkeypatch, Response(500))
+    cache = LottieCache(cache_dir=str(tmp_path / "cache"))
+    cache.seed(URL, str(seed))
+    for _ in range(5):
+        assert cache.get(URL) == ANIMATION
+        settle(cache)
+    assert origin.calls == 1
+
+
+def test_disk_entries_are_transformed_once(tmp_path, monkeypatch):
+    serve(monkeypatch, Response(200, ANIMATION))
+    calls = []
+
+    def transform(data):
+        calls.append(data)
+        return dict(data, compacted=True)
+
+    LottieCache(cache_dir=str(tmp_path), transform=transform).get(URL)
+    assert LottieCache(cache_dir=str(tmp_path), transform=transform).get(URL) == dict(ANIMATION, compacted=True)
+    assert len(calls) == 1
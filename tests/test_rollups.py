@@ -0,0 +1,128 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rollups import GROUPINGS, MEASURES, Rollups
+
+PANDAS_FREQ = {"minute": "min", "hour": "h", "day": "D"}
+
+
+# Start of each row's tier period, the pandas way
+def period_start(dates, tier):
+    if tier == "week":
+        return dates.dt.to_period("W-SUN").dt.start_time
+    if tier == "month":
+        return dates.dt.to_period("M").dt.start_time
+    return dates.dt.floor(PANDAS_FREQ[tier])
+
+
+# The periods of one tier computed with a plain groupby; last is the value
+# of the latest row in time, of equal ones the last given
+def expected_periods(df, tier, group):
+    keys = ["date"] + ([group] if group is not None else [])
+    aggs = {"count": ("sales", "size"), "last_time": ("time", "max")}
+    for measure in MEASURES:
+        for stat in ("sum", "min", "max", "last"):
+            aggs[f"{measure}_{stat}"] = (measure, stat)
+    rows = df.sort_values("date", kind="stable")
+    rows = rows.assign(time=rows["date"], date=period_start(rows["date"], tier))
+    return normalized(rows.groupby(keys, observed=True).agg(**aggs).reset_index())
+
+
+# Closed and open periods of a tier view as one frame
+def tier_frame(view):
+    parts = [pd.DataFrame(view.columns)] if view.columns else []
+    if view.open is not None:
+        parts.append(pd.DataFrame(view.open))
+    return normalized(pd.concat(parts, ignore_index=True))
+
+
+def normalized(periods):
+    periods = periods.copy()
+    for column in periods.columns:
+        if column in ("date", "last_time"):
+            periods[column] = periods[column].astype("datetime64[ns]")
+        elif column in GROUPINGS:
+            periods[column] = periods[column].astype(str)
+        else:
+            periods[column] = periods[column].astype(np.float64)
+    return periods
+
+
+def assert_matches_pandas(view, df):
+    for (tier, group), tier_view in view.tiers.items():
+        pd.testing.assert_frame_equal(
+            tier_frame(tier_view), expected_periods(df, tier, group), check_exact=False, rtol=1e-9,
+            obj=f"{tier} tier by {group}",
+        )
+
+
+def test_tiers_match_pandas(make_frame):
+    df = make_frame(3000, spacing="20min")
+    view = Rollups(df).view()
+    assert view.names == ["hour", "day", "week", "month"]
+    assert_matches_pandas(view, df)
+
+
+# Batches split periods, and runs of rows with the same time, at arbitrary
+# points; the open period must merge them in order so last stays the latest
+def test_appends_match_rollups_of_all_rows(make_frame):
+    df = make_frame(3000, spacing="20min")
+    df["date"] = df["date"].dt.floor("2h")
+    rollups = Rollups(df.iloc[:1000])
+    before = rollups.view()
+    for lo, hi in [(1000, 1001), (1001, 1038), (1038, 1600), (1600, 3000)]:
+        rollups.append(df.iloc[lo:hi])
+    assert_matches_pandas(rollups.view(), df)
+    # A view taken earlier is a snapshot
+    assert_matches_pandas(before, df.iloc[:1000])
+
+
+# Live batches can bring rows older than the open period, back into
+# periods already closed in every tier, or into periods with no rows yet
+def test_late_rows_match_pandas(make_frame):
+    df = make_frame(3000, spacing="20min")
+    rollups = Rollups(df.iloc[:2000])
+    before = rollups.view()
+    late = make_frame(300, seed=1, start="2024-01-10", spacing="5min")
+    batches = [
+        late.iloc[:100],
+        pd.concat([df.iloc[2000:2500], late.iloc[100:200]], ignore_index=True),
+        late.iloc[200:],
+        df.iloc[2500:],
+    ]
+    for batch in batches:
+        rollups.append(batch)
+    rows = pd.concat([df.iloc[:2000]] + batches, ignore_index=True)
+    view = rollups.view()
+    assert_matches_pandas(view, rows)
+    assert_matches_pandas(before, df.iloc[:2000])
+    assert view.date_bounds() == (rows["date"].min().date(), rows["date"].max().date())
+
+    date_range = (datetime.date(2024, 1, 9), datetime.date(2024, 1, 12))
+    tier, frame = view.query("sales", "sum", date_range=date_range, width_px=50)
+    start, end = pd.Timestamp(date_range[0]), pd.Timestamp(date_range[1]) + pd.Timedelta(days=1)
+    selected = rows[(rows["date"] >= start) & (rows["date"] < end)]
+    assert tier == "hour"
+    assert frame["sales"].sum() == pytest.approx(selected["sales"].sum())
+
+
+def test_query_mean_matches_pandas(make_frame):
+    df = make_frame(3000, spacing="20min")
+    date_range = (datetime.date(2024, 1, 5), datetime.date(2024, 1, 24))
+    tier, frame = Rollups(df).view().query("sales", "mean", group="region", date_range=date_range, width_px=20)
+    assert tier == "day"
+
+    start, end = pd.Timestamp(date_range[0]), pd.Timestamp(date_range[1]) + pd.Timedelta(days=1)
+    rows = df[(df["date"] >= start) & (df["date"] < end)]
+    expected = rows.groupby([rows["date"].dt.floor("D"), "region"], observed=True)["sales"].mean().reset_index()
+    pd.testing.assert_frame_equal(normalized(frame), normalized(expected), check_exact=False, rtol=1e-9)
+
+
+def test_query_falls_back_to_raw_rows(make_frame):
+    view = Rollups(make_frame(100, spacing="20min")).view()
+    assert view.query("sales", width_px=10**6) == (None, None)
+    with pytest.raises(ValueError):
+        view.query("sales", "median")
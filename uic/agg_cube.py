@@ -0,0 +1,96 @@
+# Precomputed aggregation cube: count, sum and sum of squares of every
+# measure per region x category cell (optionally per day). Pie charts,
+# heatmaps and KPI cards are answered from the cells instead of grouping the
+# full dataset, and appended rows update the cells incrementally.
+import numpy as np
+import pandas as pd
+
+DIMENSIONS = ("region", "category")
+MEASURES = ("sales", "customers")
+AGGREGATES = ("sum", "mean", "count", "var", "std")
+
+
+class AggregateCube:
+    def __init__(self, df, dimensions=DIMENSIONS, measures=MEASURES, daily=False, date_column="date"):
+        self.dimensions = list(dimensions)
+        self.measures = list(measures)
+        self.daily = daily
+        self.date_column = date_column
+        self._cells = self._aggregate(df)
+
+    def _keys(self):
+        return self.dimensions + (["day"] if self.daily else [])
+
+    def _aggregate(self, df):
+        frame = {name: df[name] for name in self.dimensions}
+        if self.daily:
+            frame["day"] = pd.to_datetime(df[self.date_column]).dt.floor("D")
+        frame["count"] = np.ones(len(df), dtype=np.int64)
+        for measure in self.measures:
+            values = df[measure].to_numpy(dtype=np.float64)
+            frame[f"{measure}_sum"] = values
+            frame[f"{measure}_sumsq"] = values * values
+
+        cells = pd.DataFrame(frame).groupby(self._keys(), observed=True).sum()
+        # Plain object keys, so cells from appended batches line up even when
+        # their categoricals have different categories
+        cells.index = pd.MultiIndex.from_frame(cells.index.to_frame(index=False).astype(object))
+        return cells
+
+    # Fold a batch of new rows into the cube
+    def append(self, rows):
+        if len(rows) == 0:
+            return
+        cells = self._cells.add(self._aggregate(rows), fill_value=0)
+        cells["count"] = cells["count"].astype(np.int64)
+        self._cells = cells
+
+    @property
+    def rows(self):
+        return int(self._cells["count"].sum())
+
+    # Distinct values of a dimension that have at least one row
+    def distinct(self, dimension):
+        return list(self._cells.index.unique(level=dimension))
+
+    def _rollup(self, by):
+        return self._cells.groupby(level=by, observed=True).sum()
+
+    @staticmethod
+    def _finish(cells, measure, agg):
+        if agg not in AGGREGATES:
+            raise ValueError(f"agg must be one of {AGGREGATES}, got {agg!r}")
+        count = cells["count"]
+        total = cells[f"{measure}_sum"]
+        if agg == "count":
+            return count
+        if agg == "sum":
+            return total
+        mean = total / count
+        if agg == "mean":
+            return mean
+        # Sample variance, as pandas computes it (ddof=1)
+        var = (cells[f"{measure}_sumsq"] - count * mean * mean) / (count - 1)
+        var = var.where(count > 1).clip(lower=0)
+        return var if agg == "var" else np.sqrt(var)
+
+    # measure aggregated per value of one dimension, like
+    # df.groupby(by)[measure].agg(agg)
+    def total(self, by, measure, agg="sum"):
+        result = self._finish(self._rollup([by]), measure, agg)
+        result.index = result.index.get_level_values(by)
+        return result.rename(measure)
+
+    # Table of measure aggregated over index x columns dimensions, like
+    # pd.pivot_table(df, values=measure, index=index, columns=columns, aggfunc=agg),
+    # which drops rows and columns with no value (e.g. var of single rows).
+    # With index == columns the table is diagonal.
+    def pivot(self, index, columns, measure, agg="sum"):
+        if index == columns:
+            result = self.total(index, measure, agg)
+            table = pd.DataFrame(np.diag(result.to_numpy(dtype=np.float64)), index=result.index, columns=result.index)
+            return table.where(np.eye(len(result), dtype=bool))
+        result = self._finish(self._rollup([index, columns]), measure, agg)
+        table = result.unstack(columns).dropna(how="all").dropna(axis=1, how="all")
+        table.index.name, table.columns.name = index, columns
+        return table.sort_index().sort_index(axis=1)
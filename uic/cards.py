@@ -0,0 +1,64 @@
+# Card components for st.markdown. Colors come from CSS custom properties
+# switched by the theme root element (see theme_root), so a card's markup is
+# the same in both themes; templates are formatted once and each distinct
+# card is memoized.
+from functools import lru_cache
+from html import escape
+
+import streamlit as st
+
+CARD_TEMPLATE = '<div class="{classes}"><h{level} class="card-title">{title}</h{level}>{body}</div>'
+STAT_TEMPLATE = (
+    '<div class="theme-card custom-card" style="text-align: center;">'
+    '<h2 style="color: {color};">{value}</h2><p>{label}</p></div>'
+)
+BANNER_TEMPLATE = (
+    '<div class="theme-card" style="padding: 10px; border-radius: 10px;">'
+    '<h1 class="card-title" style="text-align: center;">{title}</h1></div>'
+)
+THEME_ROOT_TEMPLATE = '<div class="theme-root" data-theme="{theme}"></div>'
+MAX_CARDS = 256
+
+
+# <ul> of items, which may contain inline HTML
+def bullet_list(items):
+    return "<ul>" + "".join(f"<li>{item}</li>" for item in items) + "</ul>"
+
+
+@lru_cache(maxsize=MAX_CARDS)
+def card_html(title, body="", level=3, transition=False):
+    classes = "page-transition theme-card custom-card" if transition else "theme-card custom-card"
+    return CARD_TEMPLATE.format(
+        classes=classes,
+        level=level,
+        title=escape(title),
+        body=body,
+    )
+
+
+@lru_cache(maxsize=MAX_CARDS)
+def stat_card_html(value, label, color):
+    return STAT_TEMPLATE.format(value=escape(value), label=escape(label), color=color)
+
+
+def card(title, body="", level=3, transition=False):
+    st.markdown(card_html(title, body, level, transition), unsafe_allow_html=True)
+
+
+# Page heading card with an introductory paragraph
+def page_header(title, intro):
+    card(title, f"<p>{intro}</p>", level=2, transition=True)
+
+
+def stat_card(value, label, color):
+    st.markdown(stat_card_html(value, label, color), unsafe_allow_html=True)
+
+
+def banner(title):
+    st.markdown(BANNER_TEMPLATE.format(title=escape(title)), unsafe_allow_html=True)
+
+
+# Empty marker whose data-theme attribute selects the theme's custom
+# properties; toggling the theme only changes this element
+def theme_root(theme):
+    st.markdown(THEME_ROOT_TEMPLATE.format(theme=theme), unsafe_allow_html=True)
@@ -0,0 +1,728 @@
+# Shared setup for the dashboard script and its page modules: Lottie
+# loading, the dataset and the caches derived from it, and small helpers.
+import streamlit as st
+import pandas as pd
+import numpy as np
+import os
+import threading
+import functools
+import contextlib
+from concurrent.futures import ThreadPoolExecutor, wait
+from streamlit.logger import get_logger
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+import streamlit.components.v1 as components
+import json
+from lottie_cache import LottieCache
+from lottie_compact import compact_lottie
+from static_assets import LOTTIE_PLAYER_FILE, StaticAssetStore, lottie_html
+from data_source import FileSource, FileWatcher, open_source
+from dataset import compact_frame, freeze_frame, memory_report, format_memory_report, stamp_version, data_version
+from filter_index import FilterIndex
+from result_cache import ResultCache
+from table_view import sort_ranks
+from live import LiveDataset, LiveFeed, RunningKPIs
+from rollups import Rollups, day_bounds
+from downsample import downsample_frame
+from figure_cache import FigureCache
+from progress import FRAME_RATE, TASK_WORKERS, submit_task
+from offload import OffloadPool, SharedArray, SharedArrays, SharedFrame, build_agg_cube, distribution_stats, export_rows
+from metrics import METRICS_ENABLED, MetricsRegistry, SessionMetrics, begin_run, current_run, end_run, observe_size, span
+from export import write_export
+from session_memory import SESSION_BUDGET_BYTES, session_report, trim_session
+
+# Streamlit's logger setup: a console handler at the server's logger.level
+logger = get_logger(__name__)
+
+# Static-asset mode: with server.enableStaticServing on, the stylesheet and
+# Lottie documents are written once to content-hashed files under
+# uic/static and referenced by path, instead of being re-sent every rerun
+STATIC_ASSET_MODE = st.get_option("server.enableStaticServing")
+
+@st.cache_resource
+def get_static_assets():
+    return StaticAssetStore()
+
+# Lottie URLs and the bundled copies used to seed the cache
+LOTTIE_DATA_URL = "https://assets10.lottiefiles.com/packages/lf20_UJNc2t.json"
+LOTTIE_CHART_URL = "https://assets4.lottiefiles.com/packages/lf20_zzm4z9av.json"
+LOTTIE_DASHBOARD_URL = "https://assets9.lottiefiles.com/private_files/lf30_qgah66oi.json"
+
+ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+# No copy of the dashboard animation is bundled; the chart animation stands
+# in for it until the URL has been fetched, so no URL is ever a cold miss
+LOTTIE_SEED_FILES = {
+    LOTTIE_DATA_URL: os.path.join(ASSET_DIR, "ani.json"),
+    LOTTIE_CHART_URL: os.path.join(ASSET_DIR, "ani1.json"),
+    LOTTIE_DASHBOARD_URL: os.path.join(ASSET_DIR, "ani1.json"),
+}
+
+# Compaction settings for Lottie documents sent to the browser
+LOTTIE_PRECISION = 2
+LOTTIE_DECIMATE = False
+
+# Shrink a Lottie document before it is cached and sent to the browser
+def compact_animation(doc):
+    compacted, report = compact_lottie(doc, precision=LOTTIE_PRECISION, decimate=LOTTIE_DECIMATE)
+    name = doc.get("nm", "animation")
+    logger.info(
+        "Lottie %s compacted: %d -> %d bytes (%.1fx), %d keyframes removed",
+        name, report["original_bytes"], report["compact_bytes"], report["ratio"], report["keyframes_removed"],
+    )
+    for warning in report["warnings"]:
+        logger.warning("Lottie %s: %s", name, warning)
+    return compacted
+
+# One Lottie cache per server process, shared by all sessions and reruns
+@st.cache_resource
+def get_lottie_cache():
+    cache = LottieCache(transform=compact_animation)
+    for url, filepath in LOTTIE_SEED_FILES.items():
+        cache.seed(url, filepath)
+    return cache
+
+# Simple fallback animation shown while a URL is loading or when it fails
+FALLBACK_ANIMATION = {
+    "v": "5.5.7",
+    "fr": 30,
+    "ip": 0,
+    "op": 60,
+    "w": 400,
+    "h": 300,
+    "nm": "Fallback Animation",
+    "ddd": 0,
+    "assets": [],
+    "layers": [{
+        "ddd": 0,
+        "ind": 1,
+        "ty": 4,
+        "nm": "Circle",
+        "sr": 1,
+        "ks": {
+            "o": {"a": 0, "k": 100},
+            "r": {"a": 0, "k": 0},
+            "p": {"a": 0, "k": [200, 150, 0]},
+            "a": {"a": 0, "k": [0, 0, 0]},
+            "s": {
+                "a": 1,
+                "k": [
+                    {"t": 0, "s": [100, 100, 100]},
+                    {"t": 30, "s": [150, 150, 100]},
+                    {"t": 60, "s": [100, 100, 100]}
+                ]
+            }
+        },
+        "shapes": [{
+            "ty": "el",
+            "p": {"a": 0, "k": [0, 0]},
+            "s": {"a": 0, "k": [50, 50]},
+            "d": 1,
+            "nm": "Ellipse Path 1",
+        }, {
+            "ty": "fl",
+            "c": {"a": 0, "k": [0.2, 0.5, 0.8, 1]},
+            "o": {"a": 0, "k": 100},
+            "r": 1,
+            "nm": "Fill 1",
+        }]
+    }]
+}
+
+# Minimal fallback animation used if the request fails completely
+MINIMAL_FALLBACK_ANIMATION = {
+    "v": "5.5.7",
+    "fr": 30,
+    "ip": 0,
+    "op": 60,
+    "w": 100,
+    "h": 100,
+    "nm": "Minimal Fallback",
+    "ddd": 0,
+    "assets": [],
+    "layers": [{
+        "ddd": 0,
+        "ind": 1,
+        "ty": 4,
+        "nm": "Square",
+        "sr": 1,
+        "ks": {
+            "o": {"a": 0, "k": 100},
+            "r": {"a": 1, "k": [{"t": 0, "s": [0]}, {"t": 60, "s": [360]}]},
+            "p": {"a": 0, "k": [50, 50, 0]},
+            "a": {"a": 0, "k": [0, 0, 0]},
+            "s": {"a": 0, "k": [100, 100, 100]}
+        },
+        "shapes": [{
+            "ty": "rc",
+            "d": 1,
+            "s": {"a": 0, "k": [20, 20]},
+            "p": {"a": 0, "k": [0, 0]},
+            "r": {"a": 0, "k": 0},
+            "nm": "Rectangle Path 1",
+        }, {
+            "ty": "fl",
+            "c": {"a": 0, "k": [0.8, 0.2, 0.5, 1]},
+            "o": {"a": 0, "k": 100},
+            "r": 1,
+            "nm": "Fill 1",
+        }]
+    }]
+}
+
+# Turn a finished Lottie lookup into animation JSON, with fallback
+def lottie_result(future):
+    try:
+        data = future.result()
+        if data is not None:
+            return data
+        else:
+            # Return a simple fallback animation if URL fails
+            return FALLBACK_ANIMATION
+    except Exception:
+        # Return a minimal fallback animation if the request fails completely
+        return MINIMAL_FALLBACK_ANIMATION
+
+# Enhanced function to load Lottie animation from URL with fallback
+def load_lottieurl(url):
+    return lottie_result(get_lottie_cache().submit(url))
+
+# Background tasks: work runs on a shared worker pool and the page shows its
+# progress from a fragment polled at FRAME_RATE, instead of sleeping in the
+# script thread and sending a delta per step
+@st.cache_resource
+def get_task_executor():
+    return ThreadPoolExecutor(max_workers=TASK_WORKERS, thread_name_prefix="task")
+
+# Start work(report, *args) under key, unless a task under key is still
+# running. tag records what the task is for (see supersede_task).
+def start_task(key, work, *args, tag=None):
+    task = st.session_state.get(f"task_{key}")
+    if task is None or task.done():
+        st.session_state[f"task_{key}"] = submit_task(get_task_executor(), work, *args, tag=tag)
+
+# Cancel and drop the task under key if it was started for something other
+# than tag, e.g. an export of a selection the user has since changed
+def supersede_task(key, tag):
+    task = st.session_state.get(f"task_{key}")
+    if task is not None and task.tag != tag:
+        task.cancel()
+        clear_task(key)
+
+@st.fragment(run_every=1 / FRAME_RATE)
+def task_progress_frame(key):
+    task = st.session_state.get(f"task_{key}")
+    if task is None or task.done():
+        # Rerun the page once so it can pick up the result
+        st.rerun()
+    st.progress(task.fraction)
+    st.text(task.message)
+
+# Show the progress of the task under key while it runs. Returns the task
+# once it has finished, None while it runs or if there is none.
+def task_progress(key):
+    task = st.session_state.get(f"task_{key}")
+    if task is None:
+        return None
+    if task.done():
+        return task
+    task_progress_frame(key)
+    return None
+
+def clear_task(key):
+    st.session_state.pop(f"task_{key}", None)
+
+# Animated progress bar for the demo buttons, driven by a background task
+def animated_progress(key):
+    task = task_progress(key)
+    if task is not None:
+        clear_task(key)
+        st.text("Complete!")
+
+# Date range picker whose selection survives changes to the data's date
+# bounds (live appends, a replaced data file). The widget is keyed, so new
+# bounds only limit the picker instead of giving it a new identity and
+# resetting it; the initial value is set once in session state and reset
+# only when it no longer fits the bounds.
+def date_range_input(label, key, bounds):
+    first, last = bounds
+    value = st.session_state.get(key)
+    if first is not None and (not value or value[0] < first or value[-1] > last):
+        st.session_state[key] = (first, last)
+    return st.date_input(label, key=key, min_value=first, max_value=last)
+
+# Function to toggle theme
+def toggle_theme():
+    st.session_state.theme = "dark" if st.session_state.theme == "light" else "light"
+
+# Hot-path metrics (see metrics.py): set DASHBOARD_METRICS=1 to collect
+# timing spans per run, per session and per process, and
+# DASHBOARD_METRICS_FILE to export them
+@st.cache_resource
+def get_metrics():
+    registry = MetricsRegistry()
+    registry.add_cache("filter", lambda: get_filter_cache().stats())
+    registry.add_cache("figure", lambda: get_figure_cache().stats())
+    registry.add_cache("lottie", lambda: get_lottie_cache().stats())
+    return registry
+
+def session_metrics():
+    if "metrics_session" not in st.session_state:
+        st.session_state.metrics_session = SessionMetrics()
+    return st.session_state.metrics_session
+
+@contextlib.contextmanager
+def _recorded_run(name):
+    ctx = get_script_run_ctx()
+    begin_run(name, ctx.session_id if ctx is not None else None)
+    try:
+        yield
+    finally:
+        # Also runs when the run is cut short by st.rerun()
+        run = end_run()
+        session_metrics().add(run)
+        get_metrics().add(run)
+
+# Record the with-block as one run; inside a run already being recorded
+# (a fragment called by the full run) it is a span of that run instead
+def metrics_run(name):
+    if not METRICS_ENABLED:
+        return span(name)
+    if current_run() is not None:
+        return span(name)
+    return _recorded_run(name)
+
+# Decorator for fragments (below @st.fragment): a fragment rerun is recorded
+# as a run of its own. Returns fn unchanged when metrics are off.
+def timed_fragment(name):
+    def decorate(fn):
+        if not METRICS_ENABLED:
+            return fn
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            with metrics_run(name):
+                return fn(*args, **kwargs)
+        return run
+    return decorate
+
+# st.plotly_chart serializes the whole figure on every run
+def plotly_chart(fig):
+    with span("plotly_chart"):
+        st.plotly_chart(fig, use_container_width=True)
+
+# Exports run when the download is requested or on a task worker, outside
+# any script run, so they are timed into the process-wide metrics. Large
+# ones are written by an offload worker to a temporary file.
+def timed_export(data, positions, fmt, progress=None):
+    metrics = get_metrics() if METRICS_ENABLED else None
+    with span("export", metrics):
+        if should_offload(len(data) if positions is None else len(positions)):
+            path = run_heavy(
+                export_rows, data, positions, fmt, report=progress, timeout=EXPORT_TIMEOUT, discard=os.unlink,
+            )
+            f = open(path, "rb")
+            # The open file keeps the data readable
+            os.unlink(path)
+        else:
+            f = write_export(data, positions, fmt, progress=progress)
+    if metrics is not None:
+        observe_size("export", f.seek(0, os.SEEK_END), metrics)
+        f.seek(0)
+    return f
+
+def _metrics_frame(rows, label, unit, scale):
+    return pd.DataFrame(
+        [(name, count, total * scale, mean * scale, peak * scale) for name, count, total, mean, peak in rows],
+        columns=[label, "count", f"total {unit}", f"mean {unit}", f"max {unit}"],
+    )
+
+# Keep what this session holds in session state within its budget,
+# dropping finished tasks if needed; called at the end of every full run
+def enforce_session_budget():
+    dropped = trim_session(st.session_state)
+    if dropped:
+        logger.warning("Session over its %.0f MiB budget, dropped %s", SESSION_BUDGET_BYTES / 2**20, dropped)
+    if METRICS_ENABLED:
+        observe_size("session_state", sum(size for _, size in session_report(st.session_state)))
+
+# Opt-in debug panel for the sidebar: the run that just finished, this
+# session's totals and memory, and the shared caches' hit rates
+def metrics_panel():
+    if not METRICS_ENABLED or not st.toggle("🛠 Debug metrics", key="show_metrics"):
+        return
+    session = session_metrics()
+    run = session.last_run
+    if run is not None:
+        st.caption(f"Last run: {run.name}, {run.seconds * 1000:,.1f} ms")
+        st.dataframe(_metrics_frame(run.spans.rows(), "section", "ms", 1000), hide_index=True)
+    st.caption("This session")
+    st.dataframe(_metrics_frame(session.runs.rows(), "run", "ms", 1000), hide_index=True)
+    st.dataframe(_metrics_frame(session.spans.rows(), "section", "ms", 1000), hide_index=True)
+    if session.sizes.values:
+        st.dataframe(_metrics_frame(session.sizes.rows(), "payload", "KB", 1 / 1024), hide_index=True)
+    memory = session_report(st.session_state)
+    st.caption(
+        f"Session memory: {sum(size for _, size in memory) / 1024:,.1f} KB "
+        f"of {SESSION_BUDGET_BYTES / 2**20:.0f} MiB"
+    )
+    st.dataframe(pd.DataFrame(
+        [(str(key), size / 1024) for key, size in memory[:10]], columns=["key", "KB"]
+    ), hide_index=True)
+    st.caption("Shared caches")
+    st.dataframe(pd.DataFrame([
+        {"cache": name, "hit rate": f"{stats['hit_rate']:.0%}", "hits": stats["hits"], "misses": stats["misses"]}
+        for name, stats in get_metrics().cache_stats().items()
+    ]), hide_index=True)
+    if get_metrics().path:
+        st.caption(f"Exporting to {get_metrics().path}")
+
+# Dataset source and storage options. DASHBOARD_DATA points the dashboard
+# at an Arrow IPC/Feather or Parquet file (see data_source.py); without it,
+# DASHBOARD_ROWS and DASHBOARD_FREQ set the size and date spacing of the
+# synthetic data (benchmarks). DASHBOARD_SINCE/DASHBOARD_UNTIL (dates) and
+# DASHBOARD_REGIONS/DASHBOARD_CATEGORIES (comma-separated) restrict what is
+# loaded from a file; row groups outside them are not read.
+DATASET_SOURCE = os.environ.get("DASHBOARD_DATA")
+DATASET_ROWS = int(os.environ.get("DASHBOARD_ROWS", 100))
+DATASET_FREQ = os.environ.get("DASHBOARD_FREQ", "D")
+DATASET_COLUMNS = ["date", "sales", "customers", "category", "region"]
+DATASET_DATE_RANGE = (os.environ.get("DASHBOARD_SINCE") or None, os.environ.get("DASHBOARD_UNTIL") or None)
+DATASET_VALUES = {
+    column: os.environ[var].split(",")
+    for column, var in (("region", "DASHBOARD_REGIONS"), ("category", "DASHBOARD_CATEGORIES"))
+    if os.environ.get(var)
+}
+DATASET_FLOAT32 = False
+DATASET_ARROW = False
+
+@st.cache_resource
+def get_data_source():
+    return open_source(DATASET_SOURCE, rows=DATASET_ROWS, freq=DATASET_FREQ)
+
+# One dataset per server process, shared by every session: st.cache_resource
+# hands out the same frame instead of a copy per call, so it is frozen and
+# sessions only keep row positions into it.
+@st.cache_resource
+def _load_data():
+    source = get_data_source()
+    data = source.load(DATASET_COLUMNS, DATASET_DATE_RANGE, DATASET_VALUES, arrow=DATASET_ARROW)
+    compact = compact_frame(data, float32=DATASET_FLOAT32, arrow=DATASET_ARROW)
+    logger.info(
+        "Dataset from %s, %d rows, memory usage:\n%s",
+        source.describe(), len(compact), format_memory_report(memory_report(compact, original=data)),
+    )
+    data = stamp_version(freeze_frame(compact))
+    if should_offload(len(data)) and not LIVE_MODE:
+        # Still held once: the frame sessions read is a view of the shared
+        # block the offload workers map
+        data = get_shared_frame(data_version(data), data).frame()
+    return data
+
+# Live-append mode: set DASHBOARD_LIVE=1 to append DASHBOARD_LIVE_BATCH
+# synthetic rows every DASHBOARD_LIVE_INTERVAL seconds (see live.py); the
+# Home overview refreshes on the same interval
+LIVE_MODE = os.environ.get("DASHBOARD_LIVE", "") not in ("", "0")
+LIVE_BATCH_ROWS = int(os.environ.get("DASHBOARD_LIVE_BATCH", 10))
+LIVE_INTERVAL = float(os.environ.get("DASHBOARD_LIVE_INTERVAL", 2))
+
+# Runs on the feed thread, outside any script run
+def _append_live_batch(live, source):
+    metrics = get_metrics() if METRICS_ENABLED else None
+    try:
+        with span("live_append", metrics):
+            live.append(source.next_batch(live.last_row(), LIVE_BATCH_ROWS))
+    except Exception:
+        logger.exception("Live append failed")
+
+@st.cache_resource
+def get_live_dataset():
+    live = LiveDataset(_load_data(), daily=AGG_CUBE_DAILY)
+    source = get_data_source()
+    if hasattr(source, "next_batch"):
+        LiveFeed(functools.partial(_append_live_batch, live, source), LIVE_INTERVAL)
+    else:
+        logger.warning("Live mode: no feed for %s, the dataset will not grow", source.describe())
+    return live
+
+# The live snapshot published as version, or None outside live mode
+def _live_state(version):
+    return get_live_dataset().state_for(version) if LIVE_MODE else None
+
+# Drop the dataset and everything derived from it; the next run reloads.
+# Called from the file watcher's thread when the data file is replaced.
+def invalidate_data(path=None):
+    logger.info("Data file %s changed, reloading", path)
+    _load_data.clear()
+    get_live_dataset.clear()
+    for derived in (
+        get_filter_index, get_sort_ranks, get_shared_frame, _build_agg_cube, _build_kpis, _build_rollups,
+        get_distribution_stats,
+    ):
+        derived.clear()
+    get_filter_cache().clear()
+    get_figure_cache().clear()
+
+@st.cache_resource
+def get_data_watcher():
+    source = get_data_source()
+    if not isinstance(source, FileSource):
+        return None
+    return FileWatcher(source.path, invalidate_data)
+
+def load_data():
+    get_data_watcher()
+    with span("load_data"):
+        if LIVE_MODE:
+            return get_live_dataset().state.frame
+        return _load_data()
+
+# Filter index for the Data Explorer, built once per dataset version
+@st.cache_resource(max_entries=4)
+def get_filter_index(version, _data):
+    return FilterIndex(_data)
+
+# Filter results shared by all sessions, bounded by a memory budget
+FILTER_CACHE_BYTES = 256 * 1024 * 1024
+
+@st.cache_resource
+def get_filter_cache():
+    return ResultCache(max_bytes=FILTER_CACHE_BYTES)
+
+# Level-of-detail settings: line charts are downsampled to about two points
+# per horizontal pixel of a wide chart container, dense scatter plots are
+# sampled and drawn with WebGL
+CHART_WIDTH_PX = 1200
+LINE_DOWNSAMPLE_METHOD = "lttb"
+CHART_POINT_BUDGETS = {
+    "sales_trend": 2 * CHART_WIDTH_PX,
+    "line": 2 * CHART_WIDTH_PX,
+    "scatter": 20000,
+}
+
+# Sort ranks for the Data Explorer table, built once per column and dataset version
+@st.cache_resource(max_entries=16)
+def get_sort_ranks(version, column, _data):
+    return sort_ranks(_data, column)
+
+# Heavy pandas work (see offload.py) runs in worker processes once the data
+# is large enough for it to stall other sessions; set
+# DASHBOARD_OFFLOAD_WORKERS=0 to run everything inline. Exports are
+# cancelled after EXPORT_TIMEOUT seconds.
+OFFLOAD_WORKERS = int(os.environ.get("DASHBOARD_OFFLOAD_WORKERS", 2))
+OFFLOAD_MIN_ROWS = 200_000
+EXPORT_TIMEOUT = 600
+
+@st.cache_resource
+def get_offload_pool():
+    return OffloadPool(workers=OFFLOAD_WORKERS)
+
+# The dataset in shared memory. Outside live mode this is the dataset
+# itself (see _load_data); in live mode, a copy of the latest version used
+# for offloaded work.
+@st.cache_resource(max_entries=1)
+def get_shared_frame(version, _data):
+    return SharedFrame(_data)
+
+def should_offload(rows):
+    return OFFLOAD_WORKERS > 0 and rows >= OFFLOAD_MIN_ROWS
+
+def _no_report(fraction, message=None):
+    pass
+
+# Pass the result of a task nobody is waiting for any more to discard,
+# once (and if) it finishes
+def _discard_result(future, discard):
+    if not future.cancelled() and future.exception() is None:
+        discard(future.result())
+
+# fn(report, data, *args), an offload.py operation, run in the offload pool
+# or inline for small data.
+#
+# Builds shared by every session (per dataset version, like the aggregate
+# cube) pass no report and no timeout: they are never cancelled, so a rerun
+# or another session waiting on the same cache entry gets the finished
+# result. Work for one request (an export) passes report, which gets the
+# progress and may raise to cancel, and a timeout after which it raises
+# TimeoutError. Whichever way such a wait ends early the task is cancelled,
+# and discard(result) frees what it returns should it finish anyway.
+def run_heavy(fn, data, *args, report=None, timeout=None, discard=None):
+    if not should_offload(len(data)):
+        return fn(report or _no_report, data, *args)
+    args = [SharedArray(arg) if isinstance(arg, np.ndarray) else arg for arg in args]
+    owned = [arg for arg in args if isinstance(arg, SharedArrays)]
+    shared = get_shared_frame(data_version(data), data)
+    task = get_offload_pool().submit(fn, shared, *args, timeout=timeout, owned=owned)
+    with span(f"offload_{fn.__name__}"):
+        if report is None and timeout is None:
+            return task.result()
+        finished = False
+        try:
+            while not task.wait(1 / FRAME_RATE):
+                if report is not None:
+                    report(task.fraction)
+                if task.expired():
+                    raise TimeoutError(f"{fn.__name__} took longer than {task.timeout}s")
+            result = task.result()
+            finished = True
+            return result
+        finally:
+            if not finished:
+                task.cancel()
+                if discard is not None:
+                    task.future.add_done_callback(lambda future: _discard_result(future, discard))
+
+# Aggregate cube for the Pie Chart, Heatmap and KPI cards, built once per
+# dataset version (in live mode maintained on append); set AGG_CUBE_DAILY
+# to also keep per-day cells
+AGG_CUBE_DAILY = False
+
+@st.cache_resource(max_entries=4)
+def _build_agg_cube(version, _data):
+    return run_heavy(build_agg_cube, _data, AGG_CUBE_DAILY)
+
+def get_agg_cube(version, data):
+    state = _live_state(version)
+    return state.cube if state is not None else _build_agg_cube(version, data)
+
+# Values for the Home KPI cards, per dataset version or, in live mode,
+# maintained on append
+@st.cache_resource(max_entries=4)
+def _build_kpis(version, _data):
+    kpis = RunningKPIs()
+    kpis.update(_data)
+    return kpis.values()
+
+def get_kpis(version, data):
+    state = _live_state(version)
+    return state.kpis if state is not None else _build_kpis(version, data)
+
+# Time rollups for the date-axis charts (see rollups.py), per dataset
+# version or, in live mode, maintained on append. Measures are running
+# totals, so a period is drawn at its last value.
+ROLLUP_VALUE = "last"
+
+@st.cache_resource(max_entries=4)
+def _build_rollups(version, _data):
+    return Rollups(_data).view()
+
+def get_rollups(version, data):
+    state = _live_state(version)
+    return state.rollups if state is not None else _build_rollups(version, data)
+
+# y (split by color) over date_range for a CHART_WIDTH_PX wide chart: one
+# point per period of the coarsest rollup tier that fills the width, or
+# the raw rows when no tier is fine enough. Returns (tier or None, frame).
+def time_series(data, y, color=None, date_range=None):
+    rollups = get_rollups(data_version(data), data)
+    with span("rollup_query"):
+        tier, frame = rollups.query(y, ROLLUP_VALUE, color, date_range, CHART_WIDTH_PX)
+    if frame is not None:
+        return tier, frame
+    if date_range:
+        start, end = day_bounds(date_range, None, None)
+        dates = data['date']
+        data = data[((dates >= start) & (dates < end)).to_numpy()]
+    return None, data
+
+# Points for the Home Sales Trend within its point budget
+def sales_trend(data):
+    _, points = time_series(data, 'sales')
+    return downsample_frame(points, 'date', 'sales', CHART_POINT_BUDGETS["sales_trend"], LINE_DOWNSAMPLE_METHOD)
+
+# Built Plotly figures keyed on chart settings, theme and data version
+FIGURE_CACHE_BYTES = 64 * 1024 * 1024
+
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache(max_bytes=FIGURE_CACHE_BYTES)
+
+def cached_figure(data, key, build):
+    return get_figure_cache().get_or_build(data_version(data), key, build)
+
+# Sales Distribution charts: "summary" draws them from server-side bin
+# counts and box statistics, "raw" sends every value to Plotly
+DISTRIBUTION_MODE = "summary"
+
+@st.cache_resource(max_entries=4)
+def get_distribution_stats(version, _data):
+    return run_heavy(distribution_stats, _data)
+
+# Lottie animations - fetched in parallel under one startup deadline.
+# Anything not ready in time renders the fallback and is swapped in when
+# the script run (or the fragment holding the slot) finishes, if it has
+# loaded by then; otherwise it stays on the fallback until a later run.
+LOTTIE_DEADLINE = 0.3
+# Longest a run waits at its end, in total, for animations still loading
+LOTTIE_RESOLVE_WAIT = 0.2
+LOTTIE_URLS = [LOTTIE_DATA_URL, LOTTIE_CHART_URL, LOTTIE_DASHBOARD_URL]
+
+# Slots still showing the fallback; each script run has its own thread
+_pending = threading.local()
+
+def _pending_lotties():
+    if not hasattr(_pending, "slots"):
+        _pending.slots = []
+    return _pending.slots
+
+# Start fetching every Lottie URL, waiting at most LOTTIE_DEADLINE in total
+def start_lottie_fetch():
+    _pending_lotties().clear()
+    with span("lottie_fetch"):
+        get_lottie_cache().fetch_many(LOTTIE_URLS, deadline=LOTTIE_DEADLINE)
+
+# Embed an HTML document in an iframe: st.iframe where this Streamlit has it,
+# else st.components.v1.html, which it deprecates
+def embed_html(html, height):
+    if hasattr(st, "iframe"):
+        st.iframe(html, height=height)
+    else:
+        components.html(html, height=height)
+
+def fill_lottie_slot(slot, animation, height, key, placeholder_image):
+    with span("lottie_render"), slot.container():
+        try:
+            if STATIC_ASSET_MODE:
+                assets = get_static_assets()
+                html = lottie_html(assets.publish_json(animation), height, assets.publish_file(LOTTIE_PLAYER_FILE))
+                embed_html(html, height)
+            else:
+                from streamlit_lottie import st_lottie
+                st_lottie(animation, height=height, key=key)
+        except Exception as e:
+            st.warning("Could not load animation. Using fallback.")
+            st.image(placeholder_image, use_column_width=True)
+
+# Render a Lottie slot, showing the fallback until the URL has loaded
+def lottie_slot(url, height, key, placeholder_image):
+    slot = st.empty()
+    future = get_lottie_cache().submit(url)
+    if future.done():
+        fill_lottie_slot(slot, lottie_result(future), height, key, placeholder_image)
+    else:
+        fill_lottie_slot(slot, FALLBACK_ANIMATION, height, f"{key}_pending", placeholder_image)
+        _pending_lotties().append((slot, future, height, key, placeholder_image))
+
+# Swap in Lottie animations that missed the startup deadline and have
+# loaded within LOTTIE_RESOLVE_WAIT; a slow or dead URL never holds up the run
+def resolve_pending_lotties():
+    pending = _pending_lotties()
+    if pending:
+        wait([future for _, future, *_ in pending], timeout=LOTTIE_RESOLVE_WAIT)
+    while pending:
+        slot, future, height, key, placeholder_image = pending.pop(0)
+        if future.done():
+            fill_lottie_slot(slot, lottie_result(future), height, key, placeholder_image)
+
+# True while only fragments rerun, so the end of the script is not reached
+def fragment_rerun():
+    ctx = get_script_run_ctx()
+    return ctx is not None and bool(ctx.fragment_ids_this_run)
+
+# Alternative option for loading local files if needed
+@st.cache_data
+def load_lottie_file(filepath):
+    with open(filepath, "r") as f:
+        return compact_animation(json.load(f))
+
+# Use these as alternatives if the URLs don't work
+# lottie_data = load_lottie_file("path/to/your/animation1.json")
+# lottie_chart = load_lottie_file("path/to/your/animation2.json")
+# lottie_dashboard = load_lottie_file("path/to/your/animation3.json")
@@ -0,0 +1,238 @@
+# Data sources for the dashboard dataset. The synthetic generator is the
+# default; in production the dashboard reads history from an Arrow IPC
+# (Feather) or Parquet file instead. Files are read through pyarrow.dataset
+# on a memory-mapping filesystem, so only the projected columns are touched,
+# and filters on date, region and category are pushed into the scan: Parquet
+# row groups whose statistics exclude them are skipped without being read.
+#
+# A FileWatcher polls the file and reports when it has been replaced, so the
+# caches built from it can be dropped. Replace the file atomically (write a
+# new file, then rename it over the old one); a reader still holding the
+# old mapping keeps seeing the old data.
+#
+#   python uic/data_source.py history.parquet --rows 5000000 --freq min
+import argparse
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from dataset import DATE_COLUMN
+
+FILE_FORMATS = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "ipc",
+    ".feather": "ipc",
+    ".ipc": "ipc",
+}
+# Rows per Parquet row group / IPC record batch written by write_source;
+# the unit of pruning
+ROW_GROUP_ROWS = 128 * 1024
+WATCH_INTERVAL = 2.0
+ONE_DAY = pd.Timedelta(days=1)
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.fs as pafs
+    except ImportError as e:
+        raise ImportError("File data sources need pyarrow: pip install pyarrow") from e
+    return pa, ds, pafs
+
+
+def file_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FILE_FORMATS:
+        raise ValueError(f"Unsupported data file {path!r}, expected one of {sorted(FILE_FORMATS)}")
+    return FILE_FORMATS[ext]
+
+
+# Identity of the file currently at path; changes when it is replaced or rewritten
+def file_signature(path):
+    st = os.stat(path)
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+# Start (inclusive) and end (exclusive) timestamps of the whole days from
+# start to end, both inclusive dates; either may be None
+def day_range(date_range):
+    start, end = date_range or (None, None)
+    if start is not None:
+        start = pd.Timestamp(start).floor("D")
+    if end is not None:
+        end = pd.Timestamp(end).floor("D") + ONE_DAY
+    return start, end
+
+
+# Rows of df within date_range (start, end dates, both inclusive; either may
+# be None) whose columns hold one of the given values, e.g.
+# values={"region": ["North"]}
+def filter_frame(df, date_range=None, values=None):
+    mask = np.ones(len(df), dtype=bool)
+    start, end = day_range(date_range)
+    if start is not None:
+        mask &= (df[DATE_COLUMN] >= start).to_numpy()
+    if end is not None:
+        mask &= (df[DATE_COLUMN] < end).to_numpy()
+    for column, allowed in (values or {}).items():
+        mask &= df[column].isin(allowed).to_numpy()
+    if mask.all():
+        return df
+    return df[mask].reset_index(drop=True)
+
+
+# Random walk sales data; the default when no data file is configured
+class SyntheticSource:
+    def __init__(self, rows, freq="D", start="2023-01-01"):
+        self.rows = rows
+        self.freq = freq
+        self.start = start
+
+    def describe(self):
+        return f"synthetic, {self.rows:,} rows every {self.freq}"
+
+    def _walk(self, dates, sales, customers):
+        rows = len(dates)
+        return pd.DataFrame({
+            'date': dates,
+            'sales': sales + np.random.normal(loc=100, scale=15, size=rows).cumsum(),
+            'customers': customers + np.random.normal(loc=50, scale=10, size=rows).cumsum(),
+            'category': np.random.choice(['A', 'B', 'C', 'D'], size=rows),
+            'region': np.random.choice(['North', 'South', 'East', 'West'], size=rows)
+        })
+
+    # Same signature as FileSource.load; the frame is always numpy-backed and
+    # left to compact_frame to convert
+    def load(self, columns=None, date_range=None, values=None, arrow=False):
+        data = self._walk(pd.date_range(start=self.start, periods=self.rows, freq=self.freq), 0.0, 0.0)
+        data = filter_frame(data, date_range, values)
+        return data if columns is None else data[columns]
+
+    # rows more rows continuing the random walk after last, the final row
+    # so far (live mode)
+    def next_batch(self, last, rows):
+        dates = pd.date_range(start=last['date'], periods=rows + 1, freq=self.freq)[1:]
+        return self._walk(dates, last['sales'], last['customers'])
+
+
+# Arrow IPC/Feather or Parquet file, memory-mapped
+class FileSource:
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.format = file_format(path)
+        # (row groups read, row groups in the file) of the last Parquet load
+        self.last_scan = None
+
+    def describe(self):
+        scanned = ""
+        if self.last_scan is not None:
+            scanned = f", {self.last_scan[0]} of {self.last_scan[1]} row groups read"
+        return f"{self.format} file {self.path}{scanned}"
+
+    def dataset(self):
+        _, ds, pafs = _require_pyarrow()
+        return ds.dataset(self.path, format=self.format, filesystem=pafs.LocalFileSystem(use_mmap=True))
+
+    # Scan filter for date_range and values, typed to match the file's schema
+    def filter_expression(self, schema, date_range=None, values=None):
+        pa, ds, _ = _require_pyarrow()
+        expr = None
+        clauses = []
+        start, end = day_range(date_range)
+        date_type = schema.field(DATE_COLUMN).type
+        if start is not None:
+            clauses.append(ds.field(DATE_COLUMN) >= pa.scalar(start).cast(date_type))
+        if end is not None:
+            clauses.append(ds.field(DATE_COLUMN) < pa.scalar(end).cast(date_type))
+        for column, allowed in (values or {}).items():
+            clauses.append(ds.field(column).isin(list(allowed)))
+        for clause in clauses:
+            expr = clause if expr is None else expr & clause
+        return expr
+
+    # Read columns of the rows matching date_range and values into a frame.
+    # arrow: keep Arrow-backed columns, which for an uncompressed IPC file
+    # reference the mapped pages instead of copying them.
+    def load(self, columns=None, date_range=None, values=None, arrow=False):
+        dataset = self.dataset()
+        expr = self.filter_expression(dataset.schema, date_range, values)
+        if self.format == "parquet":
+            total = kept = 0
+            for fragment in dataset.get_fragments():
+                total += fragment.num_row_groups
+                kept += len(fragment.split_by_row_group(expr)) if expr is not None else fragment.num_row_groups
+            self.last_scan = (kept, total)
+        table = dataset.to_table(columns=columns, filter=expr)
+        return table.to_pandas(types_mapper=pd.ArrowDtype if arrow else None)
+
+
+# spec: path of a data file, or None/"" for synthetic data
+def open_source(spec, rows=100, freq="D"):
+    if not spec:
+        return SyntheticSource(rows, freq)
+    return FileSource(spec)
+
+
+# Polls path every interval seconds on a daemon thread and calls
+# on_change(path) when the file there has been replaced or rewritten
+class FileWatcher:
+    def __init__(self, path, on_change, interval=WATCH_INTERVAL):
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        self.signature = file_signature(path)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watch, name="data-watch", daemon=True)
+        self._thread.start()
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            try:
+                signature = file_signature(self.path)
+            except FileNotFoundError:
+                # Between unlink and rename of a non-atomic replace
+                continue
+            if signature != self.signature:
+                self.signature = signature
+                self.on_change(self.path)
+
+    def stop(self):
+        self._stop.set()
+
+
+# Write df to path sorted by date, in row groups of row_group_rows so date
+# filters can skip most of the file. IPC files are left uncompressed so they
+# can be mapped without decoding. Writes to a temporary file first and
+# renames it into place, so watchers see one replacement.
+def write_source(df, path, row_group_rows=ROW_GROUP_ROWS):
+    pa, _, _ = _require_pyarrow()
+    table = pa.Table.from_pandas(df.sort_values(DATE_COLUMN, kind="stable"), preserve_index=False)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if file_format(path) == "parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(table, tmp_path, row_group_size=row_group_rows)
+    else:
+        import pyarrow.feather as feather
+        feather.write_feather(table, tmp_path, compression="uncompressed", chunksize=row_group_rows)
+    os.replace(tmp_path, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write synthetic dashboard data to a Parquet or Arrow file")
+    parser.add_argument("path", help="output file (.parquet, .arrow or .feather)")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="number of rows")
+    parser.add_argument("--freq", default="min", help="date spacing, a pandas frequency")
+    parser.add_argument("--row-group-rows", type=int, default=ROW_GROUP_ROWS, help="rows per row group")
+    args = parser.parse_args(argv)
+
+    write_source(SyntheticSource(args.rows, args.freq).load(), args.path, args.row_group_rows)
+    print(f"Wrote {args.rows:,} rows to {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,117 @@
+# Compact columnar representation for the dashboard dataset: categorical
+# codes for low-cardinality strings, optional float32 measures, compact date
+# storage and optional Arrow-backed columns, plus a memory-usage report and
+# read-only freezing for the frame shared by all sessions.
+import uuid
+
+import numpy as np
+import pandas as pd
+
+CATEGORICAL_COLUMNS = ["category", "region"]
+MEASURE_COLUMNS = ["sales", "customers"]
+DATE_COLUMN = "date"
+
+DATE_STORAGE = ("datetime64", "epoch", "arrow")
+VERSION_ATTR = "version"
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError("Arrow-backed columns need pyarrow: pip install pyarrow") from e
+    return pa
+
+
+# Return a compact copy of df.
+# float32: store measures as float32 instead of float64.
+# dates: "datetime64" (int64 nanoseconds, works with .dt), "epoch" (plain
+#   int64 seconds) or "arrow" (Arrow timestamps).
+# arrow: back categorical and measure columns with Arrow arrays.
+def compact_frame(df, float32=False, dates="datetime64", arrow=False):
+    if dates not in DATE_STORAGE:
+        raise ValueError(f"dates must be one of {DATE_STORAGE}, got {dates!r}")
+    pa = _require_pyarrow() if arrow or dates == "arrow" else None
+
+    columns = {}
+    for name in df.columns:
+        column = df[name]
+        if name in CATEGORICAL_COLUMNS:
+            if arrow:
+                column = column.astype(pd.ArrowDtype(pa.dictionary(pa.int8(), pa.string())))
+            else:
+                column = column.astype("category")
+        elif name in MEASURE_COLUMNS:
+            if arrow:
+                column = column.astype(pd.ArrowDtype(pa.float32() if float32 else pa.float64()))
+            elif float32:
+                column = column.astype("float32")
+        elif name == DATE_COLUMN:
+            if dates == "epoch":
+                column = column.astype("datetime64[s]").astype("int64")
+            elif dates == "arrow":
+                column = column.astype(pd.ArrowDtype(pa.timestamp("ns")))
+        columns[name] = column
+    return pd.DataFrame(columns, index=df.index)
+
+
+# Per-column memory breakdown in bytes. With original given, the report also
+# shows the original dtype and size and how much was saved. The last row
+# holds the totals.
+def memory_report(df, original=None):
+    report = pd.DataFrame({
+        "dtype": df.dtypes.astype(str),
+        "bytes": df.memory_usage(deep=True, index=False),
+    })
+    if original is not None:
+        report["original_dtype"] = original.dtypes.astype(str)
+        report["original_bytes"] = original.memory_usage(deep=True, index=False)
+        report["saved"] = 1 - report["bytes"] / report["original_bytes"]
+
+    total = {"dtype": "", "bytes": report["bytes"].sum()}
+    if original is not None:
+        total["original_dtype"] = ""
+        total["original_bytes"] = report["original_bytes"].sum()
+        total["saved"] = 1 - total["bytes"] / total["original_bytes"]
+    report.loc["total"] = total
+    return report
+
+
+def format_memory_report(report):
+    formatted = report.copy()
+    for column in ("bytes", "original_bytes"):
+        if column in formatted:
+            formatted[column] = formatted[column].map(lambda b: f"{b / 1024:,.1f} KiB")
+    if "saved" in formatted:
+        formatted["saved"] = formatted["saved"].map(lambda s: f"{s:.0%}")
+    return formatted.to_string()
+
+
+# Copy of df whose numpy-backed columns (measures, dates) are read-only, for
+# a frame shared by every session: writing through .loc/.iloc raises instead
+# of changing the data under other sessions. Arrow-backed columns are
+# immutable already; categorical codes are copied by pandas and stay
+# writable, so those columns are read-only by convention only.
+def freeze_frame(df):
+    columns = {}
+    for name in df.columns:
+        column = df[name]
+        if isinstance(column.dtype, np.dtype):
+            values = column.to_numpy().copy()
+            values.flags.writeable = False
+            column = pd.Series(values, index=df.index, name=name, copy=False)
+        columns[name] = column
+    frozen = pd.DataFrame(columns, copy=False)
+    frozen.attrs.update(df.attrs)
+    return frozen
+
+
+# Tag df with a fresh version id. Indexes and caches derived from the data
+# are keyed on it, so they are rebuilt whenever the data is regenerated.
+def stamp_version(df):
+    df.attrs[VERSION_ATTR] = uuid.uuid4().hex
+    return df
+
+
+def data_version(df):
+    return df.attrs.get(VERSION_ATTR)
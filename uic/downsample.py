@@ -0,0 +1,107 @@
+# Level-of-detail downsampling for line and scatter charts: LTTB or min/max
+# bucketing for time series, random sampling plus WebGL rendering for dense
+# scatter plots, so figures stay within a per-chart point budget.
+import numpy as np
+import pandas as pd
+
+METHODS = ("lttb", "minmax")
+# Above this many points scatter plots render with WebGL (scattergl)
+SCATTERGL_THRESHOLD = 1000
+
+
+# Largest-Triangle-Three-Buckets: indices of `threshold` points that keep the
+# visual shape of the series. x must be ascending.
+def lttb_indices(x, y, threshold):
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    sampled = np.empty(threshold, dtype=np.int64)
+    sampled[0] = 0
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        if end >= next_end:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+        else:
+            avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        sampled[i + 1] = a
+    sampled[-1] = n - 1
+    return sampled
+
+
+# Min/max bucketing: the first, last, lowest and highest point of each of
+# `buckets` equal-count buckets, which keeps every peak and trough
+def minmax_indices(y, buckets):
+    n = len(y)
+    if buckets * 4 >= n:
+        return np.arange(n)
+    edges = np.linspace(0, n, buckets + 1).astype(np.int64)
+    picked = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        window = y[start:end]
+        picked.extend((start, start + int(np.argmin(window)), start + int(np.argmax(window)), end - 1))
+    return np.unique(picked)
+
+
+def _is_continuous(column):
+    return pd.api.types.is_numeric_dtype(column) or pd.api.types.is_datetime64_any_dtype(column)
+
+
+def _axis_values(column):
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return column.to_numpy(dtype="datetime64[ns]").astype(np.int64).astype(np.float64)
+    return column.to_numpy(dtype=np.float64)
+
+
+def _downsample_series(frame, x, y, budget, method):
+    xs = _axis_values(frame[x])
+    order = None
+    if len(xs) > 1 and not (xs[1:] >= xs[:-1]).all():
+        order = np.argsort(xs, kind="stable")
+        xs = xs[order]
+    ys = frame[y].to_numpy(dtype=np.float64)
+    if order is not None:
+        ys = ys[order]
+
+    if method == "lttb":
+        picked = lttb_indices(xs, ys, budget)
+    else:
+        picked = minmax_indices(ys, max(budget // 4, 1))
+    return frame.iloc[picked if order is None else order[picked]]
+
+
+# Downsample a line-chart frame to about `budget` points, split evenly across
+# the color groups. Frames within budget, or with a categorical x axis, are
+# returned unchanged.
+def downsample_frame(df, x, y, budget, method="lttb", color=None):
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}, got {method!r}")
+    if len(df) <= budget or not _is_continuous(df[x]):
+        return df
+    if color is None:
+        return _downsample_series(df, x, y, budget, method)
+
+    groups = [group for _, group in df.groupby(color, observed=True, sort=False)]
+    per_group = max(budget // max(len(groups), 1), 3)
+    return pd.concat([_downsample_series(group, x, y, per_group, method) for group in groups])
+
+
+# Uniform random sample of at most `budget` rows, in original order
+def sample_points(df, budget, seed=0):
+    if len(df) <= budget:
+        return df
+    rng = np.random.default_rng(seed)
+    return df.iloc[np.sort(rng.choice(len(df), size=budget, replace=False))]
+
+
+def scatter_render_mode(points):
+    return "webgl" if points > SCATTERGL_THRESHOLD else "svg"
@@ -0,0 +1,98 @@
+# Chunked export of filtered rows as CSV, Parquet or Arrow IPC. Exports are
+# built only when requested, a chunk of rows at a time, into a spooled
+# temporary file instead of one large in-memory string.
+import tempfile
+
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Arrow IPC": ("arrow", "application/vnd.apache.arrow.file"),
+}
+CHUNK_ROWS = 100_000
+# Exports up to this size stay in memory; larger ones spill to disk
+SPOOL_BYTES = 16 * 1024 * 1024
+
+
+def _has_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# Formats usable in this environment; Parquet and Arrow need pyarrow
+def available_formats():
+    if _has_pyarrow():
+        return list(EXPORT_FORMATS)
+    return ["CSV"]
+
+
+# Yield the selected rows of df in chunks; an empty selection yields one
+# empty frame so writers still emit a header/schema. progress, if given, is
+# called with the fraction of rows written after each chunk.
+def iter_chunks(df, positions=None, chunk_rows=CHUNK_ROWS, progress=None):
+    rows = len(df) if positions is None else len(positions)
+    if rows == 0:
+        yield df.iloc[0:0]
+        return
+    for start in range(0, rows, chunk_rows):
+        if positions is None:
+            yield df.iloc[start:start + chunk_rows]
+        else:
+            yield df.iloc[positions[start:start + chunk_rows]]
+        if progress is not None:
+            progress(min(start + chunk_rows, rows) / rows)
+
+
+def _write_csv(f, chunks):
+    header = True
+    for chunk in chunks:
+        f.write(chunk.to_csv(index=False, header=header).encode("utf-8"))
+        header = False
+
+
+def _write_arrow(f, chunks, fmt):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                if fmt == "Parquet":
+                    writer = pq.ParquetWriter(f, table.schema)
+                else:
+                    writer = pa.ipc.new_file(f, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+# Write the rows of df at positions (all rows if None) in the given format
+# and return a file object rewound to the start; download_data reads it for
+# st.download_button.
+# Writes to f (a binary file) if given, else to a spooled temporary file.
+def write_export(df, positions=None, fmt="CSV", chunk_rows=CHUNK_ROWS, progress=None, f=None):
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}")
+
+    if f is None:
+        f = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+    chunks = iter_chunks(df, positions, chunk_rows, progress)
+    if fmt == "CSV":
+        _write_csv(f, chunks)
+    else:
+        _write_arrow(f, chunks, fmt)
+    f.seek(0)
+    return f
+
+
+# The contents of a finished export, for a st.download_button data callable.
+# Callables must return bytes or a plain file object; Streamlit rejects a
+# spooled temporary file. It reads the whole file into memory either way.
+def download_data(f):
+    f.seek(0)
+    return f.read()
@@ -0,0 +1,41 @@
+# Figure-level cache: built Plotly figures are stored keyed on the chart
+# parameters, theme and data version, with LRU eviction bounded by the size
+# of their serialized JSON. Returning to a chart configuration seen before
+# skips building the figure with plotly.express. plotly.io is imported on
+# first use, so pages without figures never load Plotly.
+from metrics import observe_size, span
+from result_cache import ResultCache
+
+
+# A cached figure with its serialized size, which the cache budgets by
+class _CachedFigure:
+    def __init__(self, figure, nbytes):
+        self.figure = figure
+        self.nbytes = nbytes
+
+
+class FigureCache:
+    def __init__(self, max_bytes):
+        self._figures = ResultCache(max_bytes)
+
+    # Return the figure for key, calling build() only on a miss. Every
+    # session gets the same Figure object, so callers must not modify it;
+    # they only hand it to the chart.
+    def get_or_build(self, version, key, build):
+        import plotly.io as pio
+
+        def build_cached():
+            with span("plotly_build"):
+                figure = build()
+            with span("plotly_to_json"):
+                nbytes = len(pio.to_json(figure, validate=False))
+            observe_size("plotly_spec", nbytes)
+            return _CachedFigure(figure, nbytes)
+
+        return self._figures.get_or_compute(version, key, build_cached).figure
+
+    def stats(self):
+        return self._figures.stats()
+
+    def clear(self):
+        self._figures.clear()
@@ -0,0 +1,167 @@
+# Live-append mode: new rows arrive in batches and are appended to the
+# dataset instead of it being reloaded. Columns live in growable buffers
+# (capacity doubles when full), and each append publishes a new read-only
+# snapshot whose columns are views of the first n rows, so appending costs
+# O(batch) and sessions holding an older snapshot are unaffected.
+#
+# Along with every snapshot the dataset publishes what the charts and KPI
+# cards need, each maintained incrementally: the latest measure values and
+# distinct dimension counts, the aggregation cube and the time rollups.
+import collections
+import copy
+import threading
+
+import numpy as np
+import pandas as pd
+
+from agg_cube import AggregateCube
+from dataset import data_version, stamp_version
+from rollups import Rollups
+
+MIN_CAPACITY = 1024
+# Snapshots kept addressable by version, for runs that started on an older one
+RECENT_STATES = 4
+
+# One published snapshot: the frame, its aggregation cube, KPI values and
+# a view of the time rollups
+LiveState = collections.namedtuple("LiveState", "frame cube kpis rollups")
+
+
+# Latest value of each measure and distinct values of each dimension, updated
+# per batch. The measures are running (cumulative) totals, so the latest
+# value is the total so far.
+class RunningKPIs:
+    def __init__(self, measures=("sales", "customers"), dimensions=("region", "category")):
+        self.rows = 0
+        self.latest = dict.fromkeys(measures, np.nan)
+        self.distinct = {dimension: set() for dimension in dimensions}
+
+    def update(self, rows):
+        if len(rows) == 0:
+            return
+        self.rows += len(rows)
+        for measure in self.latest:
+            self.latest[measure] = float(rows[measure].iloc[-1])
+        for dimension, seen in self.distinct.items():
+            seen.update(rows[dimension].dropna().unique())
+
+    def values(self):
+        return {
+            "rows": self.rows,
+            "latest": dict(self.latest),
+            "distinct": {dimension: len(seen) for dimension, seen in self.distinct.items()},
+        }
+
+
+# Appendable dataset seeded from df. state is the latest LiveState; append
+# is called from one feeder thread at a time while sessions read state.
+class LiveDataset:
+    def __init__(self, df, daily=False):
+        self._lock = threading.Lock()
+        self._rows = len(df)
+        self._buffers = {}
+        self._categories = {}
+        capacity = max(2 * len(df), MIN_CAPACITY)
+        for name in df.columns:
+            column = df[name]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                self._categories[name] = column.cat.categories
+                values = column.cat.codes.to_numpy()
+            else:
+                values = column.to_numpy()
+            buffer = np.empty(capacity, dtype=values.dtype)
+            buffer[:len(df)] = values
+            self._buffers[name] = buffer
+
+        self._kpis = RunningKPIs()
+        self._kpis.update(df)
+        self._rollups = Rollups(df)
+        self._cube = AggregateCube(df, daily=daily)
+        self._recent = collections.OrderedDict()
+        self._publish()
+
+    @property
+    def rows(self):
+        return self._rows
+
+    def state_for(self, version):
+        return self._recent.get(version)
+
+    # The final row so far, as a dict
+    def last_row(self):
+        return self.state.frame.iloc[-1].to_dict()
+
+    def _grow(self, rows):
+        capacity = max(rows, 2 * len(next(iter(self._buffers.values()))))
+        for name, buffer in self._buffers.items():
+            grown = np.empty(capacity, dtype=buffer.dtype)
+            grown[:self._rows] = buffer[:self._rows]
+            self._buffers[name] = grown
+
+    # Codes of column's values, adding categories not seen before
+    def _encode(self, name, column):
+        values = pd.Index(np.asarray(column, dtype=object))
+        categories = self._categories[name]
+        new = values.difference(categories).dropna()
+        if len(new):
+            categories = self._categories[name] = categories.append(new)
+            buffer = self._buffers[name]
+            if len(categories) > np.iinfo(buffer.dtype).max:
+                self._buffers[name] = buffer.astype(np.int32)
+        return categories.get_indexer(values)
+
+    def append(self, batch):
+        if len(batch) == 0:
+            return
+        with self._lock:
+            start, end = self._rows, self._rows + len(batch)
+            if end > len(next(iter(self._buffers.values()))):
+                self._grow(end)
+            for name in list(self._buffers):
+                column = batch[name]
+                values = self._encode(name, column) if name in self._categories else column.to_numpy()
+                self._buffers[name][start:end] = values
+            self._rows = end
+
+            self._kpis.update(batch)
+            self._rollups.append(batch)
+            # Published cubes are never changed; append replaces the cells
+            # of a shallow copy
+            cube = copy.copy(self._cube)
+            cube.append(batch)
+            self._cube = cube
+            self._publish()
+
+    def _publish(self):
+        columns = {}
+        for name, buffer in self._buffers.items():
+            view = buffer[:self._rows]
+            view.flags.writeable = False
+            if name in self._categories:
+                view = pd.Categorical.from_codes(
+                    view, dtype=pd.CategoricalDtype(self._categories[name]), validate=False,
+                )
+            columns[name] = pd.Series(view, name=name, copy=False)
+        frame = stamp_version(pd.DataFrame(columns, copy=False))
+        state = LiveState(frame, self._cube, self._kpis.values(), self._rollups.view())
+        self._recent[data_version(frame)] = state
+        while len(self._recent) > RECENT_STATES:
+            self._recent.popitem(last=False)
+        self.state = state
+
+
+# Calls append_batch() every interval seconds on a daemon thread
+class LiveFeed:
+    def __init__(self, append_batch, interval):
+        self.append_batch = append_batch
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="live-feed", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.append_batch()
+
+    def stop(self):
+        self._stop.set()
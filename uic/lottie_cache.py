@@ -0,0 +1,258 @@
+# Two-tier cache for Lottie animation JSON: in-process memory plus an on-disk
+# store keyed by URL, with TTL and ETag/Last-Modified revalidation. Failed
+# requests are remembered per URL and not retried until a backoff (or the
+# server's Retry-After) has passed, so a dead origin costs one request per
+# backoff period instead of one per rerun.
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+CACHE_DIR = os.environ.get(
+    "LOTTIE_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".lottie_cache"),
+)
+DEFAULT_TTL = 24 * 60 * 60
+REQUEST_TIMEOUT = 5
+FETCH_WORKERS = 4
+# Seconds before retrying a failed URL, doubling per failure up to the max
+FAILURE_BACKOFF = 60
+MAX_FAILURE_BACKOFF = 30 * 60
+
+
+class LottieCache:
+    # transform, if given, is applied to every document entering the cache
+    # (e.g. compaction) so it runs once per fetch instead of once per render
+    def __init__(self, cache_dir=CACHE_DIR, ttl=DEFAULT_TTL, timeout=REQUEST_TIMEOUT, transform=None):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.timeout = timeout
+        self.transform = transform
+        self._memory = {}
+        self._inflight = set()
+        self._pending = {}
+        # url -> (retry_at, backoff) after a failed request
+        self._failures = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="lottie")
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def _path(self, url):
+        name = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, name + ".json")
+
+    def _read_disk(self, url):
+        try:
+            with open(self._path(url), "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("url") == url else None
+
+    def _write_disk(self, url, entry):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(url)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(entry, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except OSError:
+            # The disk tier is best effort; the memory tier still works
+            pass
+
+    def _lookup(self, url):
+        with self._lock:
+            entry = self._memory.get(url)
+        if entry is None:
+            entry = self._read_disk(url)
+            if entry is not None and not entry.get("transformed"):
+                entry = self._transformed(entry)
+                with self._lock:
+                    self._memory.setdefault(url, entry)
+        return entry
+
+    # Entries are stored transformed and marked so, so reading one back from
+    # disk does not transform it again
+    def _transformed(self, entry):
+        if self.transform is None:
+            return entry
+        return dict(entry, data=self.transform(entry["data"]), transformed=True)
+
+    def _store(self, url, entry, transform=True):
+        if transform:
+            entry = self._transformed(entry)
+        with self._lock:
+            self._memory[url] = entry
+        self._write_disk(url, entry)
+        return entry
+
+    # Remember that a request for url failed; retry_after is the server's
+    # Retry-After header, if any
+    def _record_failure(self, url, retry_after=None):
+        try:
+            retry_after = float(retry_after)
+        except (TypeError, ValueError):
+            retry_after = 0
+        with self._lock:
+            _, backoff = self._failures.get(url, (0, FAILURE_BACKOFF / 2))
+            backoff = min(backoff * 2, MAX_FAILURE_BACKOFF)
+            self._failures[url] = (time.time() + max(backoff, retry_after), backoff)
+
+    # True while url failed recently and should not be requested again
+    def _backing_off(self, url):
+        with self._lock:
+            failure = self._failures.get(url)
+        return failure is not None and time.time() < failure[0]
+
+    def _is_fresh(self, entry):
+        return time.time() - entry["fetched_at"] < self.ttl
+
+    # Seed an entry from a bundled file; it is stored as already expired so
+    # it is served immediately and revalidated against the URL in the
+    # background, or, with fresh=True, served without revalidation until the
+    # TTL runs out
+    def seed(self, url, filepath, fresh=False):
+        if self._lookup(url) is not None:
+            return
+        try:
+            with open(filepath, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self._store(url, {
+            "url": url,
+            "etag": None,
+            "last_modified": None,
+            "fetched_at": time.time() if fresh else 0,
+            "data": data,
+        })
+
+    # Conditional GET against the origin. Returns the (possibly refreshed)
+    # entry, or None when the server answered with anything but 200/304.
+    # Failures, including network errors, start a backoff for url.
+    def _revalidate(self, url, entry):
+        import requests
+
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            r = requests.get(url, headers=headers, timeout=self.timeout)
+            data = r.json() if r.status_code == 200 else None
+        except (requests.RequestException, ValueError):
+            self._record_failure(url)
+            raise
+        if r.status_code not in (200, 304) or (r.status_code == 304 and entry is None):
+            self._record_failure(url, r.headers.get("Retry-After"))
+            return None
+        with self._lock:
+            self._failures.pop(url, None)
+
+        if r.status_code == 304:
+            # The cached document was already transformed when first stored
+            entry = dict(entry, fetched_at=time.time())
+            return self._store(url, entry, transform=False)
+        entry = {
+            "url": url,
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+            "data": data,
+        }
+        return self._store(url, entry)
+
+    def _revalidate_in_background(self, url, entry):
+        if self._backing_off(url):
+            return
+        with self._lock:
+            if url in self._inflight:
+                return
+            self._inflight.add(url)
+
+        def run():
+            import requests
+
+            try:
+                self._revalidate(url, entry)
+            except (requests.RequestException, ValueError):
+                pass
+            finally:
+                with self._lock:
+                    self._inflight.discard(url)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    # Return the animation for url. Fresh entries are served from cache,
+    # stale ones are served immediately while a background revalidation runs,
+    # and only a cold miss goes to the network. Returns None when the server
+    # rejects the request, or while a failed URL is backing off; network
+    # errors on a cold miss propagate.
+    def get(self, url):
+        entry = self._lookup(url)
+        if entry is None:
+            self.misses += 1
+            if self._backing_off(url):
+                return None
+            entry = self._revalidate(url, None)
+            return entry["data"] if entry is not None else None
+        if not self._is_fresh(entry):
+            self.stale_hits += 1
+            self._revalidate_in_background(url, entry)
+        else:
+            self.hits += 1
+        return entry["data"]
+
+    # Like get, but returns a Future. Cached entries, and URLs backing off,
+    # resolve immediately; a cold miss is fetched on the pool, shared by
+    # every caller asking for the same URL while it is in flight.
+    def submit(self, url):
+        if self._lookup(url) is not None or self._backing_off(url):
+            future = Future()
+            future.set_result(self.get(url))
+            return future
+
+        with self._lock:
+            future = self._pending.get(url)
+            if future is not None:
+                return future
+            future = self._executor.submit(self.get, url)
+            self._pending[url] = future
+        future.add_done_callback(lambda f: self._forget_pending(url, f))
+        return future
+
+    def _forget_pending(self, url, future):
+        with self._lock:
+            if self._pending.get(url) is future:
+                del self._pending[url]
+
+    # Start fetching every URL at once and wait at most deadline seconds in
+    # total. Returns {url: Future}; futures still running keep filling the
+    # cache after the deadline.
+    def fetch_many(self, urls, deadline):
+        futures = {url: self.submit(url) for url in urls}
+        wait(list(futures.values()), timeout=deadline)
+        return futures
+
+    # Lookups served fresh, served stale (revalidating) and fetched cold
+    def stats(self):
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._memory),
+            "hits": self.hits + self.stale_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
@@ -0,0 +1,212 @@
+# Hot-path instrumentation: timing spans around the expensive sections of a
+# script run (data generation, Lottie loads, filtering, exports, pivots,
+# Plotly serialization) and the sizes of the payloads they produce. Spans
+# are collected per run, summed per session and per process, and exported
+# as Prometheus text or JSON lines.
+#
+# Collection is off unless DASHBOARD_METRICS is set; span() then returns a
+# shared no-op context manager, so instrumented code pays one function call.
+import contextlib
+import json
+import os
+import threading
+import time
+
+METRICS_ENABLED = os.environ.get("DASHBOARD_METRICS", "") not in ("", "0")
+# Export file: a *.prom file is rewritten with Prometheus text (e.g. for the
+# node_exporter textfile collector), anything else gets one JSON line per run
+METRICS_FILE = os.environ.get("DASHBOARD_METRICS_FILE")
+METRIC_PREFIX = "dashboard"
+
+_NULL_SPAN = contextlib.nullcontext()
+_local = threading.local()
+
+
+# Count, sum and maximum of the values observed under each name
+class Summary:
+    def __init__(self):
+        self.values = {}
+
+    def observe(self, name, value):
+        count, total, peak = self.values.get(name, (0, 0, 0))
+        self.values[name] = (count + 1, total + value, max(peak, value))
+
+    def merge(self, other):
+        for name, (count, total, peak) in other.values.items():
+            mine = self.values.get(name, (0, 0, 0))
+            self.values[name] = (mine[0] + count, mine[1] + total, max(mine[2], peak))
+
+    def totals(self):
+        return {name: total for name, (_, total, _) in self.values.items()}
+
+    # (name, count, total, mean, max), largest total first
+    def rows(self):
+        return [
+            (name, count, total, total / count, peak)
+            for name, (count, total, peak) in sorted(self.values.items(), key=lambda item: -item[1][1])
+        ]
+
+
+# One script run, full or fragment: its spans and payload sizes
+class RunRecord:
+    def __init__(self, name, session_id=None):
+        self.name = name
+        self.session_id = session_id
+        self.started_at = time.time()
+        self.seconds = None
+        self.spans = Summary()
+        self.sizes = Summary()
+        self._start = time.perf_counter()
+
+    def observe(self, name, seconds):
+        self.spans.observe(name, seconds)
+
+    def observe_size(self, name, nbytes):
+        self.sizes.observe(name, nbytes)
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self._start
+
+    def to_dict(self):
+        return {
+            "ts": self.started_at,
+            "session": self.session_id,
+            "run": self.name,
+            "ms": round(self.seconds * 1000, 3),
+            "spans_ms": {name: round(total * 1000, 3) for name, total in self.spans.totals().items()},
+            "sizes_bytes": self.sizes.totals(),
+        }
+
+
+# Per-session totals, kept in session state
+class SessionMetrics:
+    def __init__(self):
+        self.runs = Summary()
+        self.spans = Summary()
+        self.sizes = Summary()
+        self.last_run = None
+
+    def add(self, run):
+        self.runs.observe(run.name, run.seconds)
+        self.spans.merge(run.spans)
+        self.sizes.merge(run.sizes)
+        self.last_run = run
+
+
+# Process-wide totals across sessions, plus spans timed outside any run
+# (deferred downloads, background tasks), cache statistics and the export
+class MetricsRegistry(SessionMetrics):
+    def __init__(self, path=METRICS_FILE):
+        super().__init__()
+        self.path = path
+        self.caches = {}
+        self._lock = threading.Lock()
+
+    # stats is called at export time and returns a ResultCache-style dict
+    def add_cache(self, name, stats):
+        self.caches[name] = stats
+
+    def observe(self, name, seconds):
+        with self._lock:
+            self.spans.observe(name, seconds)
+
+    def observe_size(self, name, nbytes):
+        with self._lock:
+            self.sizes.observe(name, nbytes)
+
+    def add(self, run):
+        with self._lock:
+            super().add(run)
+        if self.path:
+            self.export(run)
+
+    def cache_stats(self):
+        return {name: stats() for name, stats in self.caches.items()}
+
+    def prometheus(self):
+        with self._lock:
+            families = [
+                ("run_seconds", "Script run time by run (app or fragment).", "run", self.runs),
+                ("section_seconds", "Time spent in instrumented sections.", "section", self.spans),
+                ("payload_bytes", "Size of payloads built by instrumented sections.", "payload", self.sizes),
+            ]
+            lines = []
+            for metric, help_text, label, summary in families:
+                name = f"{METRIC_PREFIX}_{metric}"
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} summary"]
+                for key, (count, total, _) in sorted(summary.values.items()):
+                    lines.append(f'{name}_sum{{{label}="{key}"}} {total:.6f}')
+                    lines.append(f'{name}_count{{{label}="{key}"}} {count}')
+                lines += [f"# HELP {name}_max Largest single observation.", f"# TYPE {name}_max gauge"]
+                for key, (_, _, peak) in sorted(summary.values.items()):
+                    lines.append(f'{name}_max{{{label}="{key}"}} {peak:.6f}')
+        for field, kind in (("hits", "counter"), ("misses", "counter"), ("hit_rate", "gauge"), ("bytes", "gauge")):
+            name = f"{METRIC_PREFIX}_cache_{field}" + ("_total" if kind == "counter" else "")
+            lines.append(f"# TYPE {name} {kind}")
+            for cache, stats in sorted(self.cache_stats().items()):
+                if field in stats:
+                    lines.append(f'{name}{{cache="{cache}"}} {stats[field]}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, run):
+        if self.path.endswith(".prom"):
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(self.prometheus())
+            os.replace(tmp_path, self.path)
+        else:
+            line = json.dumps(dict(run.to_dict(), caches=self.cache_stats()))
+            with self._lock, open(self.path, "a") as f:
+                f.write(line + "\n")
+
+
+def current_run():
+    return getattr(_local, "run", None)
+
+
+# Start recording a run on this thread; returns its record
+def begin_run(name, session_id=None):
+    _local.run = RunRecord(name, session_id)
+    return _local.run
+
+
+def end_run():
+    run = _local.run
+    _local.run = None
+    run.finish()
+    return run
+
+
+class _Span:
+    __slots__ = ("name", "target", "start")
+
+    def __init__(self, name, target):
+        self.name = name
+        self.target = target
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.target.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+# Time the with-block as section name of the current run, or of target
+# (anything with observe(), e.g. the registry) outside a run
+def span(name, target=None):
+    if not METRICS_ENABLED:
+        return _NULL_SPAN
+    target = target or current_run()
+    if target is None:
+        return _NULL_SPAN
+    return _Span(name, target)
+
+
+def observe_size(name, nbytes, target=None):
+    if not METRICS_ENABLED:
+        return
+    target = target or current_run()
+    if target is not None:
+        target.observe_size(name, nbytes)
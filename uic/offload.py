@@ -0,0 +1,327 @@
+# Process-pool offload for heavy pandas work: building the aggregation cube
+# and the distribution statistics (groupby), and writing exports (to_csv,
+# Parquet). Run on a script thread, that work holds the GIL and stalls every
+# other session in the server process; in a worker process it does not.
+#
+# Data reaches the workers through shared memory instead of pickles. A
+# SharedFrame copies a frame's columns into one shared block (once per
+# dataset version, by the caller's cache) and pickles as a small handle;
+# workers map the block and rebuild the frame without copying. Large array
+# arguments travel the same way as SharedArrays.
+#
+# Each task has a slot in a shared array holding its progress and a cancel
+# flag. Cancellation is cooperative: a queued task is dropped, a running
+# one stops at its next progress report (exports report every chunk). A
+# single pandas call already running finishes and its result is discarded.
+import collections
+import concurrent.futures
+import contextlib
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from agg_cube import AggregateCube
+from export import write_export
+from progress import TaskCancelled
+from summary_stats import box_stats, histogram_bins
+
+OFFLOAD_WORKERS = 2
+TASK_SLOTS = 256
+# Column offsets in a shared block are aligned to this many bytes
+ALIGN = 64
+# Blocks a worker keeps mapped, most recently used last
+WORKER_MAPPED_BLOCKS = 4
+PROGRESS, CANCEL = 0, 1
+
+
+# Shared memory block that may still be viewed by arrays when it is garbage
+# collected at exit, which SharedMemory.__del__ reports as an error
+class _Block(shared_memory.SharedMemory):
+    def __del__(self):
+        with contextlib.suppress(BufferError, OSError):
+            self.close()
+
+
+# Blocks closed while arrays still viewed them; they stay mapped until the
+# arrays are gone and are closed by a later _close
+_retired = []
+_retired_lock = threading.Lock()
+
+
+# Close shm unless arrays still view it (closing would unmap memory under
+# them), in which case it is retired and closed once they are gone
+def _close(shm):
+    with _retired_lock:
+        _retired.append(shm)
+        for block in list(_retired):
+            try:
+                block.close()
+            except BufferError:
+                continue
+            _retired.remove(block)
+
+
+def _release(shm):
+    shm.unlink()
+    _close(shm)
+
+
+# Array over buf at offset. np.frombuffer keeps a buffer export for as long
+# as the array lives, so the block cannot be unmapped under it.
+def _view(buf, dtype, shape, offset):
+    count = int(np.prod(shape, dtype=np.int64))
+    return np.frombuffer(buf, dtype=dtype, count=count, offset=offset).reshape(shape)
+
+
+# Numpy arrays in one shared memory block. Pickles as a handle (block name
+# and layout); the creating process unlinks the block when the object is
+# garbage collected or closed.
+class SharedArrays:
+    def __init__(self, arrays):
+        layout = []
+        offset = 0
+        for name, values in arrays.items():
+            values = np.ascontiguousarray(values)
+            layout.append((name, values.dtype.str, values.shape, offset))
+            offset += -(-values.nbytes // ALIGN) * ALIGN
+        shm = _Block(create=True, size=max(offset, 1))
+        for (name, dtype, shape, start), values in zip(layout, arrays.values()):
+            _view(shm.buf, dtype, shape, start)[...] = values
+        self.name = shm.name
+        self.layout = layout
+        self._shm = shm
+        self._finalizer = weakref.finalize(self, _release, shm)
+
+    def __getstate__(self):
+        return {"name": self.name, "layout": self.layout}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._shm = None
+        self._finalizer = None
+
+    def close(self):
+        if self._finalizer is not None:
+            self._finalizer()
+
+    def _block(self):
+        return self._shm if self._shm is not None else _mapped_block(self.name)
+
+    # The arrays, read-only unless writable
+    def arrays(self, writable=False):
+        buf = self._block().buf
+        arrays = {}
+        for name, dtype, shape, start in self.layout:
+            values = _view(buf, dtype, shape, start)
+            values.flags.writeable = writable
+            arrays[name] = values
+        return arrays
+
+    # What a task receives in place of this argument
+    def resolve(self):
+        arrays = self.arrays()
+        return arrays["values"] if list(arrays) == ["values"] else arrays
+
+
+def SharedArray(values):
+    return SharedArrays({"values": values})
+
+
+# A frame's numpy and categorical columns in shared memory; other columns
+# (object, Arrow-backed) are pickled with the handle
+class SharedFrame(SharedArrays):
+    def __init__(self, df):
+        arrays = {}
+        self.categories = {}
+        self.pickled = {}
+        for name in df.columns:
+            column = df[name]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                self.categories[name] = column.cat.categories
+                arrays[name] = column.cat.codes.to_numpy()
+            elif isinstance(column.dtype, np.dtype) and column.dtype != object:
+                arrays[name] = column.to_numpy()
+            else:
+                self.pickled[name] = column
+        self.columns = list(df.columns)
+        self.attrs = dict(df.attrs)
+        super().__init__(arrays)
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state.update(categories=self.categories, pickled=self.pickled, columns=self.columns, attrs=self.attrs)
+        return state
+
+    def frame(self):
+        arrays = self.arrays()
+        columns = {}
+        for name in self.columns:
+            if name in self.pickled:
+                columns[name] = self.pickled[name]
+                continue
+            values = arrays[name]
+            if name in self.categories:
+                values = pd.Categorical.from_codes(
+                    values, dtype=pd.CategoricalDtype(self.categories[name]), validate=False,
+                )
+            columns[name] = pd.Series(values, name=name, copy=False)
+        df = pd.DataFrame(columns, copy=False)
+        df.attrs.update(self.attrs)
+        return df
+
+    def resolve(self):
+        return self.frame()
+
+
+# Worker process state: the slot array and the blocks mapped so far
+_worker = {"slots": None, "blocks": collections.OrderedDict()}
+
+
+def _mapped_block(name):
+    blocks = _worker["blocks"]
+    if name not in blocks:
+        blocks[name] = _Block(name=name)
+        while len(blocks) > WORKER_MAPPED_BLOCKS:
+            _close(blocks.popitem(last=False)[1])
+    blocks.move_to_end(name)
+    return blocks[name]
+
+
+def _init_worker(slots):
+    _worker["slots"] = slots.arrays(writable=True)["values"]
+
+
+# Runs in the worker: fn(report, *args) with shared arguments resolved
+def _run(slot, fn, args):
+    slots = _worker["slots"]
+
+    def report(fraction, message=None):
+        if slots[slot, CANCEL]:
+            raise TaskCancelled()
+        slots[slot, PROGRESS] = fraction
+
+    report(0.0)
+    args = [arg.resolve() if isinstance(arg, SharedArrays) else arg for arg in args]
+    return fn(report, *args)
+
+
+# A spawned process first re-runs the parent's __main__, which under
+# `streamlit run` is the dashboard script. The executor spawns workers as
+# tasks are submitted, so submit under a bare __main__ instead.
+@contextlib.contextmanager
+def _bare_main():
+    main = sys.modules["__main__"]
+    sys.modules["__main__"] = types.ModuleType("__main__")
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = main
+
+
+class OffloadTask:
+    def __init__(self, pool, slot, future, timeout):
+        self.pool = pool
+        self.slot = slot
+        self.future = future
+        self.timeout = timeout
+        self.started_at = time.monotonic()
+
+    @property
+    def fraction(self):
+        return float(self.pool.slots[self.slot, PROGRESS])
+
+    def done(self):
+        return self.future.done()
+
+    def expired(self):
+        return self.timeout is not None and time.monotonic() - self.started_at > self.timeout
+
+    # True once the task has finished, False after waiting up to timeout
+    def wait(self, timeout):
+        done, _ = concurrent.futures.wait([self.future], timeout=timeout)
+        return bool(done)
+
+    def result(self):
+        return self.future.result()
+
+    def cancel(self):
+        if not self.future.cancel() and not self.future.done():
+            self.pool.slots[self.slot, CANCEL] = 1
+
+
+# Worker processes plus the shared task slots. Workers are started with
+# spawn: forking a threaded server process is not safe.
+class OffloadPool:
+    def __init__(self, workers=OFFLOAD_WORKERS, slots=TASK_SLOTS):
+        self._slot_block = SharedArray(np.zeros((slots, 2)))
+        self.slots = self._slot_block.arrays(writable=True)["values"]
+        self._free = list(range(slots))
+        self._lock = threading.Lock()
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self._slot_block,),
+        )
+
+    # Run fn(report, *args) in a worker. fn must be importable by the worker
+    # (a module-level function); SharedArrays arguments arrive resolved.
+    # owned blocks are closed once the task has finished.
+    def submit(self, fn, *args, timeout=None, owned=()):
+        with self._lock:
+            if not self._free:
+                raise RuntimeError("No free offload task slots")
+            slot = self._free.pop()
+            self.slots[slot] = 0
+            with _bare_main():
+                future = self._executor.submit(_run, slot, fn, args)
+        future.add_done_callback(lambda _: self._finish(slot, owned))
+        return OffloadTask(self, slot, future, timeout)
+
+    def _finish(self, slot, owned):
+        for block in owned:
+            block.close()
+        with self._lock:
+            self._free.append(slot)
+
+    # Cancel everything and wait for the workers to exit; they map the slot
+    # block, so it is only released afterwards
+    def shutdown(self):
+        self.slots[:, CANCEL] = 1
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._slot_block.close()
+
+
+# Offloaded operations; each takes report and the resolved arguments
+
+def build_agg_cube(report, df, daily):
+    return AggregateCube(df, daily=daily)
+
+
+def distribution_stats(report, df):
+    return {
+        "histogram": histogram_bins(df['sales'], nbins=20),
+        "box": box_stats(df, 'region', 'sales'),
+    }
+
+
+# Write the export to a named temporary file and return its path; the
+# caller opens and unlinks it. A cancelled or failed export leaves no file.
+def export_rows(report, df, positions, fmt):
+    f = tempfile.NamedTemporaryFile(prefix="export-", delete=False)
+    try:
+        with f:
+            write_export(df, positions, fmt, progress=report, f=f)
+    except BaseException:
+        os.unlink(f.name)
+        raise
+    return f.name
@@ -0,0 +1,62 @@
+# Background tasks with progress reporting. The work runs on a worker thread
+# and only records its latest progress; the page polls the task at a capped
+# frame rate, so the script thread is free while the task runs and the
+# browser receives at most FRAME_RATE updates per second however often the
+# work reports. A cancelled task stops at its next progress report.
+import time
+
+FRAME_RATE = 10
+TASK_WORKERS = 4
+
+
+class TaskCancelled(Exception):
+    pass
+
+
+class ProgressTask:
+    def __init__(self, tag=None):
+        self.fraction = 0.0
+        self.message = ""
+        self.started_at = time.monotonic()
+        self.future = None
+        # What the task was started for, e.g. the settings of an export
+        self.tag = tag
+        self.cancelled = False
+
+    # Called from the worker thread; plain attribute writes, so reporting on
+    # every step of a tight loop is cheap
+    def report(self, fraction, message=None):
+        if self.cancelled:
+            raise TaskCancelled()
+        self.fraction = min(max(float(fraction), 0.0), 1.0)
+        if message is not None:
+            self.message = message
+
+    def done(self):
+        return self.future.done()
+
+    def cancel(self):
+        self.cancelled = True
+        self.future.cancel()
+
+    def elapsed(self):
+        return time.monotonic() - self.started_at
+
+    # The work's return value; re-raises its exception
+    def result(self):
+        return self.future.result()
+
+
+# Run work(report, *args) on executor and return its ProgressTask
+def submit_task(executor, work, *args, tag=None):
+    task = ProgressTask(tag)
+    task.future = executor.submit(work, task.report, *args)
+    return task
+
+
+# Simulated work for the animation demos: steps of delay seconds
+def demo_work(report, steps=100, delay=0.01):
+    for i in range(steps + 1):
+        report(i / steps, f"Progress: {i}%")
+        time.sleep(delay)
+    return steps
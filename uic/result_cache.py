@@ -0,0 +1,84 @@
+# Process-wide LRU cache for query results (e.g. filter row positions),
+# bounded by a memory budget and shared read-only across sessions.
+# sizeof gives the byte size of a value (default: its nbytes).
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def _nbytes(value):
+    return getattr(value, "nbytes", 0)
+
+
+def _read_only(value):
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    return value
+
+
+class ResultCache:
+    def __init__(self, max_bytes, sizeof=_nbytes):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            _, value = self._entries.popitem(last=False)
+            self._bytes -= self.sizeof(value)
+            self.evictions += 1
+
+    def _reset(self, version):
+        self._entries.clear()
+        self._bytes = 0
+        self._version = version
+
+    # Return the cached value for key, computing and storing it on a miss.
+    # Results of a different data version are dropped first, so entries never
+    # outlive the data they were computed from. Values are made read-only
+    # because every session shares the same object.
+    def get_or_compute(self, version, key, compute):
+        with self._lock:
+            if version != self._version:
+                self._reset(version)
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = _read_only(compute())
+        size = self.sizeof(value)
+        with self._lock:
+            if version != self._version or size > self.max_bytes:
+                return value
+            if key not in self._entries:
+                self._entries[key] = value
+                self._bytes += size
+                self._evict()
+        return value
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._reset(None)
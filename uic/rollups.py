@@ -0,0 +1,296 @@
+# Multi-resolution time rollups for time-axis charts. The measures are
+# rolled up per minute, hour, day, week and month (overall and per region
+# and per category), keeping count, sum, min, max and last value per period.
+# A chart asks for a date range and its width in pixels and gets the
+# coarsest tier that still has at least one point per pixel over the range,
+# so it touches thousands of rows instead of millions. Only tiers coarser
+# than the data's own spacing are kept; below them the raw rows are used.
+#
+# Tiers are appendable: each keeps its closed periods in growable buffers
+# and the latest, still open period separately, so an append only rolls up
+# the new rows and merges them into the open period. Rows older than the
+# open period are merged into the closed periods they belong to, which
+# rewrites the closed periods from the first one they touch on. view()
+# returns a read-only snapshot that later appends do not change.
+import numpy as np
+import pandas as pd
+
+MEASURES = ("sales", "customers")
+GROUPINGS = (None, "region", "category")
+# Finest first, with the approximate width of a period
+TIERS = (
+    ("minute", pd.Timedelta(minutes=1)),
+    ("hour", pd.Timedelta(hours=1)),
+    ("day", pd.Timedelta(days=1)),
+    ("week", pd.Timedelta(weeks=1)),
+    ("month", pd.Timedelta(days=30.44)),
+)
+TIER_WIDTHS = dict(TIERS)
+# The tier each tier is rolled up from; weeks do not nest in months
+SOURCES = {"hour": "minute", "day": "hour", "week": "day", "month": "day"}
+VALUES = ("last", "mean", "sum", "min", "max")
+MIN_CAPACITY = 256
+ONE_DAY = pd.Timedelta(days=1)
+
+
+NS_PER_SECOND = 10**9
+SECONDS_PER_DAY = 86400
+FLOOR_SECONDS = {"minute": 60, "hour": 3600, "day": SECONDS_PER_DAY}
+
+
+# Start of the tier period containing each of dates (datetime64[ns]).
+# Weeks start on Monday; 1970-01-01, day 0, was a Thursday.
+def _period_start(dates, tier):
+    if tier == "month":
+        return dates.astype("datetime64[M]").astype("datetime64[ns]")
+    ns = dates.astype(np.int64)
+    if tier == "week":
+        days = ns // (SECONDS_PER_DAY * NS_PER_SECOND)
+        return ((days - (days + 3) % 7) * SECONDS_PER_DAY * NS_PER_SECOND).astype("datetime64[ns]")
+    width = FLOOR_SECONDS[tier] * NS_PER_SECOND
+    return (ns // width * width).astype("datetime64[ns]")
+
+
+# Periods are dicts of equal-length arrays: date (period start), the group
+# column if any, count, last_time (time of the row last comes from) and
+# sum/min/max/last of every measure.
+
+# Raw rows as one-row periods
+def _row_periods(df, group, measures, date_column):
+    dates = df[date_column].to_numpy(dtype="datetime64[ns]")
+    periods = {"date": dates}
+    if group is not None:
+        periods[group] = df[group].array
+    periods["last_time"] = dates
+    periods["count"] = np.ones(len(df), dtype=np.int64)
+    for measure in measures:
+        values = df[measure].to_numpy(dtype=np.float64)
+        for stat in ("sum", "min", "max", "last"):
+            periods[f"{measure}_{stat}"] = values
+    return periods
+
+
+def _concat(a, b):
+    return {name: np.concatenate([np.asarray(a[name]), np.asarray(b[name])]) for name in a}
+
+
+def _slice(periods, lo, hi):
+    return {name: values[lo:hi] for name, values in periods.items()}
+
+
+# Combine periods into periods of tier (or, without tier, merge periods
+# with the same start), sorted by start and group. last is taken from the
+# period with the latest last_time, or of equal ones the last given, so it
+# does not depend on the order rows arrived in.
+def _rollup(periods, group, measures, tier=None):
+    dates = periods["date"] if tier is None else _period_start(periods["date"], tier)
+    if group is None:
+        order = np.lexsort((periods["last_time"], dates))
+        keys = [dates[order]]
+    else:
+        codes, labels = pd.factorize(periods[group], sort=True, use_na_sentinel=False)
+        order = np.lexsort((periods["last_time"], codes, dates))
+        keys = [dates[order], codes[order]]
+    changed = np.zeros(len(order), dtype=bool)
+    changed[0] = True
+    for key in keys:
+        changed[1:] |= key[1:] != key[:-1]
+    starts = np.flatnonzero(changed)
+    lasts = np.append(starts[1:], len(order)) - 1
+
+    rolled = {"date": keys[0][starts]}
+    if group is not None:
+        rolled[group] = np.asarray(labels, dtype=object)[keys[1][starts]]
+    rolled["count"] = np.add.reduceat(periods["count"][order], starts)
+    rolled["last_time"] = periods["last_time"][order][lasts]
+    for measure in measures:
+        rolled[f"{measure}_sum"] = np.add.reduceat(periods[f"{measure}_sum"][order], starts)
+        rolled[f"{measure}_min"] = np.minimum.reduceat(periods[f"{measure}_min"][order], starts)
+        rolled[f"{measure}_max"] = np.maximum.reduceat(periods[f"{measure}_max"][order], starts)
+        rolled[f"{measure}_last"] = periods[f"{measure}_last"][order][lasts]
+    return rolled
+
+
+# Start (inclusive) and end (exclusive) of the whole days in date_range,
+# or of the days from first to last
+def day_bounds(date_range, first, last):
+    if date_range:
+        first, last = date_range[0], date_range[-1]
+    return pd.Timestamp(first).floor("D"), pd.Timestamp(last).floor("D") + ONE_DAY
+
+
+# One tier of one grouping
+class Tier:
+    def __init__(self, name, group, measures):
+        self.name = name
+        self.group = group
+        self.measures = list(measures)
+        self.rows = 0
+        self.open = None
+        self._buffers = {}
+
+    def _write(self, closed):
+        count = len(closed["date"])
+        if count == 0:
+            return
+        start, end = self.rows, self.rows + count
+        capacity = len(self._buffers["date"]) if self._buffers else 0
+        if end > capacity:
+            capacity = max(end, 2 * capacity, MIN_CAPACITY)
+            for name, values in closed.items():
+                grown = np.empty(capacity, dtype=values.dtype)
+                if name in self._buffers:
+                    grown[:start] = self._buffers[name][:start]
+                self._buffers[name] = grown
+        for name, values in closed.items():
+            self._buffers[name][start:end] = values
+        self.rows = end
+
+    # Merge late, periods of this tier in date order that start before the
+    # open period, into the closed periods. Those from the first one late
+    # touches on are rolled up again with it and written to new buffers, so
+    # views already handed out keep their snapshot.
+    def _merge_closed(self, late):
+        lo = 0
+        if self.rows:
+            lo = int(np.searchsorted(self._buffers["date"][:self.rows], late["date"][0], side="left"))
+            late = _rollup(_concat(_slice(self._buffers, lo, self.rows), late), self.group, self.measures)
+        kept = _slice(self._buffers, 0, lo)
+        self._buffers = {}
+        self.rows = 0
+        self._write(_concat(kept, late) if lo else late)
+
+    # Merge rolled, periods of this tier in date order, into the tier
+    def append(self, rolled):
+        if len(rolled["date"]) == 0:
+            return
+        if self.open is not None:
+            late = int(np.searchsorted(rolled["date"], self.open["date"][0], side="left"))
+            if late:
+                self._merge_closed(_slice(rolled, 0, late))
+                rolled = _slice(rolled, late, len(rolled["date"]))
+                if len(rolled["date"]) == 0:
+                    return
+            rolled = _rollup(_concat(self.open, rolled), self.group, self.measures)
+        dates = rolled["date"]
+        split = np.searchsorted(dates, dates[-1], side="left")
+        self._write(_slice(rolled, 0, split))
+        self.open = _slice(rolled, split, len(dates))
+
+    def view(self):
+        columns = {}
+        for name, buffer in self._buffers.items():
+            columns[name] = buffer[:self.rows]
+            columns[name].flags.writeable = False
+        return TierView(self.name, columns, self.open)
+
+
+class TierView:
+    def __init__(self, name, columns, open_periods):
+        self.name = name
+        self.columns = columns
+        self.open = open_periods
+
+    # Periods starting in [start, end), plus the one containing start, as a frame
+    def query(self, start, end):
+        start = _period_start(np.array([start.to_datetime64()], dtype="datetime64[ns]"), self.name)[0]
+        end = end.to_datetime64()
+        parts = []
+        if self.columns:
+            dates = self.columns["date"]
+            lo, hi = np.searchsorted(dates, [start, end], side="left")
+            parts.append(_slice(self.columns, lo, hi))
+        if self.open is not None and start <= self.open["date"][0] < end:
+            parts.append(self.open)
+        if not parts:
+            return pd.DataFrame(columns=list(self.open))
+        return pd.DataFrame(parts[0] if len(parts) == 1 else _concat(*parts))
+
+
+# Rollups of df, maintained with append(rows); appended rows may be older
+# than rows already rolled up
+class Rollups:
+    def __init__(self, df, measures=MEASURES, groupings=GROUPINGS, date_column="date"):
+        self.measures = list(measures)
+        self.groupings = list(groupings)
+        self.date_column = date_column
+        self.first = self.last = None
+        spacing = pd.Timedelta(0)
+        if len(df) > 1:
+            dates = df[date_column]
+            spacing = (dates.max() - dates.min()) / (len(df) - 1)
+        self.names = [name for name, width in TIERS if width > spacing]
+        self.tiers = {
+            (name, group): Tier(name, group, self.measures) for name in self.names for group in self.groupings
+        }
+        self.append(df)
+
+    # Nearest finer tier that is kept, or None for the raw rows
+    def _source(self, name):
+        source = SOURCES.get(name)
+        while source is not None and source not in self.names:
+            source = SOURCES.get(source)
+        return source
+
+    def append(self, rows):
+        if len(rows) == 0:
+            return
+        dates = rows[self.date_column]
+        first, last = dates.min(), dates.max()
+        self.first = first if self.first is None else min(self.first, first)
+        self.last = last if self.last is None else max(self.last, last)
+        if not self.names:
+            return
+        for group in self.groupings:
+            periods = _row_periods(rows, group, self.measures, self.date_column)
+            rolled = {}
+            for name in self.names:
+                source = self._source(name)
+                rolled[name] = _rollup(periods if source is None else rolled[source], group, self.measures, name)
+                self.tiers[(name, group)].append(rolled[name])
+
+    def view(self):
+        return RollupsView({key: tier.view() for key, tier in self.tiers.items()}, self.names, self.first, self.last)
+
+
+class RollupsView:
+    def __init__(self, tiers, names, first, last):
+        self.tiers = tiers
+        self.names = names
+        self.first = first
+        self.last = last
+
+    # (first, last) date as datetime.date objects
+    def date_bounds(self):
+        if self.first is None:
+            return None, None
+        return pd.Timestamp(self.first).date(), pd.Timestamp(self.last).date()
+
+    # Coarsest tier with at least width_px periods between start and end,
+    # or None when even the finest kept tier has fewer
+    def choose(self, start, end, width_px):
+        for name in reversed(self.names):
+            if (end - start) / TIER_WIDTHS[name] >= width_px:
+                return name
+        return None
+
+    # (tier, frame) with date, the group column and measure's value per
+    # period over date_range, for a chart width_px wide; (None, None) when
+    # no tier is fine enough and the raw rows should be used
+    def query(self, measure, value="last", group=None, date_range=None, width_px=1200):
+        if value not in VALUES:
+            raise ValueError(f"value must be one of {VALUES}, got {value!r}")
+        if not self.names or self.first is None:
+            return None, None
+        start, end = day_bounds(date_range, self.first, self.last)
+        tier = self.choose(start, end, width_px)
+        if tier is None:
+            return None, None
+        periods = self.tiers[(tier, group)].query(start, end)
+        if value == "mean":
+            values = periods[f"{measure}_sum"] / periods["count"]
+        else:
+            values = periods[f"{measure}_{value}"]
+        frame = periods[["date"] + ([group] if group is not None else [])].copy()
+        frame[measure] = values.to_numpy()
+        return tier, frame
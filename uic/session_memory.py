@@ -0,0 +1,78 @@
+# Per-session memory accounting. Every session reads the same read-only
+# dataset and the process-wide caches; what a session holds on its own is its
+# session state: widget values, row-position views, finished background tasks
+# and their results (e.g. a prepared export). retained_bytes estimates that
+# state, counting read-only arrays, which are views into the shared dataset
+# or cache entries, as shared. Sessions over their budget drop finished
+# tasks, largest first.
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from progress import ProgressTask
+
+SESSION_BUDGET_BYTES = 32 * 1024 * 1024
+TASK_PREFIX = "task_"
+
+
+def _task_bytes(task, seen):
+    if not task.done() or task.future.cancelled() or task.future.exception() is not None:
+        return sys.getsizeof(task)
+    return sys.getsizeof(task) + retained_bytes(task.result(), seen)
+
+
+# Bytes value keeps alive beyond what is shared with other sessions.
+# Containers are followed; objects reachable twice are counted once.
+def retained_bytes(value, seen=None):
+    if seen is None:
+        seen = set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    if isinstance(value, np.ndarray):
+        if not value.flags.writeable or value.base is not None:
+            return 0
+        return value.nbytes
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, tempfile.SpooledTemporaryFile):
+        # Only the in-memory buffer counts; a rolled-over file lives on disk
+        return 0 if value._rolled else sys.getsizeof(value._file)
+    if isinstance(value, ProgressTask):
+        return _task_bytes(value, seen)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            retained_bytes(k, seen) + retained_bytes(v, seen) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(retained_bytes(item, seen) for item in value)
+    return sys.getsizeof(value)
+
+
+# [(key, bytes)] for a session state mapping, largest first
+def session_report(state):
+    seen = set()
+    report = [(key, retained_bytes(value, seen)) for key, value in state.items()]
+    return sorted(report, key=lambda item: item[1], reverse=True)
+
+
+# Drop finished tasks, largest first, until the session is within budget.
+# Returns the dropped keys; running tasks and other state are never dropped.
+def trim_session(state, budget=SESSION_BUDGET_BYTES):
+    report = session_report(state)
+    total = sum(size for _, size in report)
+    dropped = []
+    for key, size in report:
+        if total <= budget:
+            break
+        value = state[key]
+        if str(key).startswith(TASK_PREFIX) and isinstance(value, ProgressTask) and value.done():
+            del state[key]
+            total -= size
+            dropped.append(key)
+    return dropped
@@ -0,0 +1,133 @@
+# Cold-start import profiler for the dashboard. Imports the modules pp.py
+# imports at top level, then each page module, in a fresh interpreter run
+# with -X importtime, and reports the cost of each import and the slowest
+# modules underneath. Exits non-zero when the startup or a page exceeds its
+# time budget, so the budget can be enforced in CI:
+#
+#   python uic/startup_profile.py --budget-ms 2000 --page-budget-ms 500
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPT = os.path.join(APP_DIR, "pp.py")
+STARTUP_BUDGET_MS = 2000
+PAGE_BUDGET_MS = 500
+RUNS = 3
+
+# Runs in the child interpreter: import each module in turn and print the
+# wall time of each import as JSON
+PROBE = """
+import importlib, json, sys, time
+timings = []
+for name in sys.argv[1:]:
+    start = time.perf_counter()
+    try:
+        importlib.import_module(name)
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    timings.append({"module": name, "ms": (time.perf_counter() - start) * 1000, "error": error})
+print(json.dumps(timings))
+"""
+
+
+# Module names pp.py imports at top level, in order
+def startup_modules(script=SCRIPT):
+    with open(script) as f:
+        tree = ast.parse(f.read())
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            names.append(node.module)
+    return names
+
+
+def page_modules():
+    sys.path.insert(0, APP_DIR)
+    from views import PAGES
+    return PAGES
+
+
+# Parse -X importtime output into {module: (self_us, cumulative_us)}
+def parse_importtime(stderr):
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace("import time:", "|", 1).split("|"))
+        modules[name] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+# Import modules in order in a fresh interpreter; returns the per-import
+# timings and the -X importtime breakdown
+def profile_imports(modules):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE, *modules],
+        cwd=APP_DIR, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1]), parse_importtime(result.stderr)
+
+
+# Best of several runs, to keep scheduler noise out of the budget check
+def best_of(modules, runs):
+    best = None
+    for _ in range(runs):
+        timings, breakdown = profile_imports(modules)
+        if best is None or sum(t["ms"] for t in timings) < sum(t["ms"] for t in best[0]):
+            best = (timings, breakdown)
+    return best
+
+
+def report_startup(timings, breakdown, budget_ms, top):
+    total = sum(t["ms"] for t in timings)
+    print(f"Startup imports of pp.py: {total:.0f} ms (budget {budget_ms} ms)")
+    for t in timings:
+        note = f"  FAILED {t['error']}" if t["error"] else ""
+        print(f"  {t['module']:<32} {t['ms']:8.1f} ms{note}")
+    print("Slowest modules by self time:")
+    slowest = sorted(breakdown.items(), key=lambda item: item[1][0], reverse=True)[:top]
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"  {name:<48} {self_us / 1000:8.1f} ms self {cumulative_us / 1000:8.1f} ms cumulative")
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile dashboard import times against a budget")
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS, help="cold-start import budget")
+    parser.add_argument("--page-budget-ms", type=float, default=PAGE_BUDGET_MS, help="extra import budget per page")
+    parser.add_argument("--runs", type=int, default=RUNS, help="runs per measurement; the fastest is kept")
+    parser.add_argument("--top", type=int, default=15, help="number of slowest modules to list")
+    args = parser.parse_args(argv)
+
+    startup = startup_modules()
+    timings, breakdown = best_of(startup, args.runs)
+    total = report_startup(timings, breakdown, args.budget_ms, args.top)
+    failed = [t for t in timings if t["error"]]
+    over = total > args.budget_ms
+
+    print("Pages, extra imports on first open:")
+    for page, module in page_modules().items():
+        page_timings, _ = best_of(startup + [module], args.runs)
+        page_timing = page_timings[-1]
+        note = f"  FAILED {page_timing['error']}" if page_timing["error"] else ""
+        print(f"  {page:<32} {page_timing['ms']:8.1f} ms{note}")
+        failed += [page_timing] if page_timing["error"] else []
+        over |= page_timing["ms"] > args.page_budget_ms
+
+    if failed:
+        return 2
+    if over:
+        print("Over the startup time budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+# Content-addressed static assets. Each asset is written once under a name
+# derived from its hash and served from Streamlit's app/static route, so
+# reruns only reference it by path and the browser keeps its cached copy.
+# The Lottie player is vendored (vendor/lottie.min.js) and served the same
+# way, so animations need no third-party CDN and work offline.
+import hashlib
+import json
+import os
+import threading
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+STATIC_URL = "app/static"
+HASH_LENGTH = 16
+MAX_REMEMBERED_DOCS = 64
+
+LOTTIE_PLAYER_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "vendor", "lottie.min.js")
+
+
+class StaticAssetStore:
+    def __init__(self, directory=STATIC_DIR, url_prefix=STATIC_URL):
+        self.directory = directory
+        self.url_prefix = url_prefix
+        self._published = {}
+        self._by_id = {}
+        self._files = {}
+        self._lock = threading.Lock()
+
+    # Write content (str or bytes) to <hash>.<extension> unless it is already
+    # there, and return the URL path it is served from
+    def publish(self, content, extension):
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+        name = f"{digest}.{extension}"
+
+        with self._lock:
+            if name in self._published:
+                return self._published[name]
+
+        path = os.path.join(self.directory, name)
+        if not os.path.exists(path):
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+
+        url = f"{self.url_prefix}/{name}"
+        with self._lock:
+            self._published[name] = url
+        return url
+
+    # Publish the file at path, read and hashed once per store
+    def publish_file(self, path):
+        with self._lock:
+            url = self._files.get(path)
+        if url is None:
+            with open(path, "rb") as f:
+                url = self.publish(f.read(), os.path.splitext(path)[1].lstrip("."))
+            with self._lock:
+                self._files[path] = url
+        return url
+
+    # Publish a JSON document. Documents are usually the same cached objects
+    # on every rerun, so the path is remembered per object to skip
+    # re-serializing and re-hashing them.
+    def publish_json(self, doc):
+        with self._lock:
+            known = self._by_id.get(id(doc))
+        if known is not None and known[0] is doc:
+            return known[1]
+        url = self.publish(json.dumps(doc, separators=(",", ":")), "json")
+        with self._lock:
+            if len(self._by_id) >= MAX_REMEMBERED_DOCS:
+                self._by_id.clear()
+            # Keep a reference to doc so its id cannot be reused by another object
+            self._by_id[id(doc)] = (doc, url)
+        return url
+
+
+# Small HTML page that plays a Lottie animation fetched from asset_url with
+# the player script at player_url
+def lottie_html(asset_url, height, player_url):
+    return f"""
+<style>html, body {{ margin: 0; overflow: hidden; }}</style>
+<div id="lottie" style="height: {height}px;"></div>
+<script src="{player_url}"></script>
+<script>
+    lottie.loadAnimation({{
+        container: document.getElementById("lottie"),
+        renderer: "svg",
+        loop: true,
+        autoplay: true,
+        path: "{asset_url}"
+    }});
+</script>
+"""
+
+
+# Tiny <style> block that pulls in a published stylesheet
+def stylesheet_import(asset_url):
+    return f'<style>@import url("{asset_url}");</style>'
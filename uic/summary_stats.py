@@ -0,0 +1,97 @@
+# Server-side summary statistics for distribution charts: histogram bin
+# counts and box-plot quartiles, whiskers and outlier samples are computed
+# with NumPy, so figures carry O(bins + groups) values instead of every row.
+# Plotly is only imported by the figure builders.
+import numpy as np
+import pandas as pd
+
+MAX_OUTLIERS = 50
+
+
+def histogram_bins(values, nbins=20):
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    counts, edges = np.histogram(values, bins=nbins)
+    return edges, counts
+
+
+# Quartiles, whiskers (most extreme values within 1.5 IQR of the box), mean
+# and up to max_outliers sampled outliers of value per group of `by`
+def box_stats(df, by, value, max_outliers=MAX_OUTLIERS, seed=0):
+    codes, groups = pd.factorize(df[by], sort=True)
+    values = df[value].to_numpy(dtype=np.float64)
+    rng = np.random.default_rng(seed)
+
+    stats = []
+    for code, group in enumerate(groups):
+        v = values[codes == code]
+        v = v[~np.isnan(v)]
+        if len(v) == 0:
+            continue
+        q1, median, q3 = np.quantile(v, [0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        inside = v[(v >= q1 - 1.5 * iqr) & (v <= q3 + 1.5 * iqr)]
+        outliers = v[(v < q1 - 1.5 * iqr) | (v > q3 + 1.5 * iqr)]
+        if len(outliers) > max_outliers:
+            outliers = rng.choice(outliers, size=max_outliers, replace=False)
+        stats.append({
+            "group": group,
+            "q1": q1,
+            "median": median,
+            "q3": q3,
+            "lowerfence": inside.min(),
+            "upperfence": inside.max(),
+            "mean": v.mean(),
+            "count": len(v),
+            "outliers": np.sort(outliers),
+        })
+    return stats
+
+
+def histogram_figure(edges, counts, x_title, template, opacity=0.7):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        opacity=opacity,
+        marker_line_width=0,
+    ))
+    fig.update_layout(template=template, xaxis_title=x_title, yaxis_title="count", bargap=0)
+    return fig
+
+
+# Box plot drawn from precomputed statistics, one colored trace per group
+# like px.box(color=by); outliers are drawn as markers
+def box_figure(stats, by, value, template):
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    colors = px.colors.qualitative.Plotly
+    fig = go.Figure()
+    for i, group in enumerate(stats):
+        color = colors[i % len(colors)]
+        fig.add_trace(go.Box(
+            name=str(group["group"]),
+            x=[group["group"]],
+            q1=[group["q1"]],
+            median=[group["median"]],
+            q3=[group["q3"]],
+            lowerfence=[group["lowerfence"]],
+            upperfence=[group["upperfence"]],
+            mean=[group["mean"]],
+            marker_color=color,
+            legendgroup=str(group["group"]),
+        ))
+        if len(group["outliers"]):
+            fig.add_trace(go.Scatter(
+                x=[group["group"]] * len(group["outliers"]),
+                y=group["outliers"],
+                mode="markers",
+                marker_color=color,
+                legendgroup=str(group["group"]),
+                showlegend=False,
+            ))
+    fig.update_layout(template=template, xaxis_title=by, yaxis_title=value, legend_title_text=by)
+    return fig
@@ -0,0 +1,73 @@
+# Server-side table view for the Data Explorer: sort and search run on row
+# positions against the dataset, and only one page of rows is materialized
+# and sent to the browser.
+import numpy as np
+import pandas as pd
+
+PAGE_SIZE = 50
+
+
+def _sort_values(column):
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.codes.to_numpy()
+    return column.to_numpy()
+
+
+# Rank of every row when the dataset is sorted by column (ties keep row
+# order). Built once per column; sorting a selection is then an integer
+# argsort over the selected ranks.
+def sort_ranks(df, column):
+    order = np.argsort(_sort_values(df[column]), kind="stable")
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = np.arange(len(order), dtype=np.int64)
+    return ranks
+
+
+def sort_positions(positions, ranks, ascending=True):
+    keys = ranks[positions]
+    if not ascending:
+        keys = -keys
+    return positions[np.argsort(keys, kind="stable")]
+
+
+def _is_text(column):
+    return isinstance(column.dtype, pd.CategoricalDtype) or not (
+        pd.api.types.is_numeric_dtype(column) or pd.api.types.is_datetime64_any_dtype(column)
+    )
+
+
+# Keep the positions whose value in any text column contains term
+# (case-insensitive). Categorical columns only test their categories.
+def search_positions(df, positions, term, columns=None):
+    term = term.strip().lower()
+    if not term:
+        return positions
+    if columns is None:
+        columns = [name for name in df.columns if _is_text(df[name])]
+
+    mask = np.zeros(len(positions), dtype=bool)
+    for name in columns:
+        column = df[name]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            matching = [
+                code for code, value in enumerate(column.cat.categories)
+                if term in str(value).lower()
+            ]
+            if matching:
+                mask |= np.isin(column.cat.codes.to_numpy()[positions], matching)
+        else:
+            values = column.iloc[positions].astype(str).str.lower()
+            mask |= values.str.contains(term, regex=False).to_numpy(dtype=bool)
+    return positions[mask]
+
+
+def page_count(rows, page_size=PAGE_SIZE):
+    return max(1, -(-rows // page_size))
+
+
+# Positions on the given 1-based page, with the 0-based [start, end) range
+def page_window(positions, page, page_size=PAGE_SIZE):
+    page = min(max(page, 1), page_count(len(positions), page_size))
+    start = (page - 1) * page_size
+    end = min(start + page_size, len(positions))
+    return positions[start:end], start, end
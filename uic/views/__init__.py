@@ -0,0 +1,11 @@
+# Page modules of the dashboard, each with a render() function. pp.py
+# imports a page's module the first time the page is opened.
+PAGES = {
+    "Home": "views.home",
+    "Data Explorer": "views.data_explorer",
+    "Visualizations": "views.visualizations",
+    "About": "views.about",
+}
+# Pages with Plotly figures, which are built for the current theme; cards
+# follow the theme through CSS variables and need no rerun
+FIGURE_PAGES = {"Home", "Visualizations"}
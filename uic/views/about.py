@@ -0,0 +1,59 @@
+# About page: features, usage notes and the libraries used
+import streamlit as st
+from common import LOTTIE_DATA_URL, animated_progress, lottie_slot, start_task, timed_fragment
+from cards import bullet_list, card, page_header
+from progress import demo_work
+
+# Reruns on its own when the button is clicked
+@st.fragment
+@timed_fragment("random_animation")
+def random_animation():
+    if st.button("🎬 Show Random Animation"):
+        start_task("random_animation", demo_work)
+    animated_progress("random_animation")
+
+def render():
+    page_header(
+        "About This Dashboard",
+        "This interactive dashboard demonstrates various animations and UI features in Streamlit."
+    )
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        card("Features Demonstrated", bullet_list((
+            "<strong>Theme Switching:</strong> Toggle between light and dark modes",
+            "<strong>Page Transitions:</strong> Smooth animations between pages",
+            "<strong>Interactive Elements:</strong> Animated buttons, cards, and controls",
+            "<strong>Responsive Layout:</strong> Adapts to different screen sizes",
+            "<strong>Data Visualization:</strong> Multiple chart types with interactive controls",
+            "<strong>Custom Styling:</strong> CSS animations and hover effects",
+            "<strong>Lottie Animations:</strong> Engaging vector animations",
+        )))
+        
+        card("How to Use", (
+            "<p>Navigate through the dashboard using the sidebar menu. Each section demonstrates different interactive features:</p>"
+            + bullet_list((
+                "<strong>Home:</strong> Overview and key metrics",
+                "<strong>Data Explorer:</strong> Filter and examine the dataset",
+                "<strong>Visualizations:</strong> Interactive charts and graphs",
+                "<strong>About:</strong> Information about the dashboard",
+            ))
+            + "<p>Toggle between light and dark themes using the button in the sidebar.</p>"
+        ))
+    
+    with col2:
+        lottie_slot(LOTTIE_DATA_URL, 200, "about_animation", "https://via.placeholder.com/200x150?text=Animation")
+        
+        card("Libraries Used", bullet_list((
+            "Streamlit",
+            "Pandas & NumPy",
+            "Plotly Express",
+            "Streamlit Lottie",
+            "Streamlit Option Menu",
+            "Custom CSS",
+        )))
+        
+        card("Try It Out!", "<p>Click the button below to see a random animation effect:</p>")
+        
+        random_animation()
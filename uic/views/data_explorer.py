@@ -0,0 +1,144 @@
+# Data Explorer page: filter panel and the paged, searchable table
+import streamlit as st
+from common import (
+    LOTTIE_CHART_URL, data_version, date_range_input, get_filter_cache, get_filter_index, get_sort_ranks,
+    load_data, lottie_slot, resolve_pending_lotties, start_task, supersede_task, task_progress, timed_export,
+    timed_fragment,
+)
+from cards import card, page_header
+from export import EXPORT_FORMATS, available_formats, download_data
+from metrics import span
+from table_view import PAGE_SIZE, sort_positions, search_positions, page_count, page_window
+
+# Selections larger than this are exported by a background task
+BACKGROUND_EXPORT_ROWS = 200_000
+
+# Filter panel and table rerun on their own when a filter changes
+@st.fragment
+@timed_fragment("explorer")
+def explorer():
+    data = load_data()
+    filter_index = get_filter_index(data_version(data), data)
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col2:
+        lottie_slot(LOTTIE_CHART_URL, 200, "chart_animation", "https://via.placeholder.com/200x150?text=Chart")
+        
+        card("Data Filters")
+        
+        # Filters
+        date_range = date_range_input("Select Date Range", "explorer_date_range", filter_index.date_bounds())
+        
+        selected_regions = st.multiselect(
+            "Select Regions",
+            filter_index.values('region'),
+            default=filter_index.values('region')
+        )
+        
+        selected_categories = st.multiselect(
+            "Select Categories",
+            filter_index.values('category'),
+            default=filter_index.values('category')
+        )
+    
+    with col1:
+        # Filter data: the index resolves the filters to row positions,
+        # shared with every session that applies the same filters
+        filter_selections = {'region': selected_regions, 'category': selected_categories}
+        with span("filter"):
+            filtered_positions = get_filter_cache().get_or_compute(
+                data_version(data),
+                filter_index.filter_key(date_range, filter_selections),
+                lambda: filter_index.positions(date_range, filter_selections)
+            )
+        
+        # Display filtered data
+        card("Filtered Data")
+        
+        # Search and sort run server-side on row positions
+        table_col1, table_col2, table_col3 = st.columns([2, 1, 1])
+        with table_col1:
+            search_term = st.text_input("Search", "")
+        with table_col2:
+            sort_column = st.selectbox("Sort by", ["None"] + list(data.columns))
+        with table_col3:
+            sort_order = st.selectbox("Order", ["Ascending", "Descending"])
+        
+        def compute_table_positions():
+            positions = search_positions(data, filtered_positions, search_term)
+            if sort_column != "None":
+                ranks = get_sort_ranks(data_version(data), sort_column, data)
+                positions = sort_positions(positions, ranks, ascending=sort_order == "Ascending")
+            return positions
+        
+        table_key = (
+            "table", filter_index.filter_key(date_range, filter_selections),
+            search_term.strip().lower(), sort_column, sort_order
+        )
+        with span("search_sort"):
+            table_positions = get_filter_cache().get_or_compute(
+                data_version(data), table_key, compute_table_positions
+            )
+        
+        # Only the current page of rows is sent to the browser; the pager
+        # starts over whenever the filters, search or sort change
+        page = st.number_input(
+            "Page",
+            min_value=1,
+            max_value=page_count(len(table_positions)),
+            value=1,
+            key=f"table_page_{hash(table_key)}"
+        )
+        page_positions, page_start, page_end = page_window(table_positions, page)
+        with span("table"):
+            st.dataframe(
+                data.iloc[page_positions],
+                use_container_width=True,
+                height=400
+            )
+        st.caption(f"Rows {page_start + 1 if page_end else 0:,}–{page_end:,} of {len(table_positions):,} ({PAGE_SIZE} per page)")
+        
+        # Download button with animation; the export is only built, in
+        # chunks, when the button is clicked. Large exports are prepared by a
+        # background task with a progress bar instead of blocking the click;
+        # changing the selection or format cancels one still running.
+        export_format = st.selectbox("Export format", available_formats())
+        export_extension, export_mime = EXPORT_FORMATS[export_format]
+        # Not keyed on the data version: in live mode an export of the
+        # snapshot it started on stays valid while rows are appended
+        export_key = (filter_index.filter_key(date_range, filter_selections), export_format)
+        supersede_task("export", export_key)
+        if len(filtered_positions) <= BACKGROUND_EXPORT_ROWS:
+            st.download_button(
+                label="📥 Download Filtered Data",
+                data=lambda: download_data(timed_export(data, filtered_positions, export_format)),
+                file_name=f"filtered_data.{export_extension}",
+                mime=export_mime,
+            )
+        else:
+            if st.button("📦 Prepare Export"):
+                start_task("export", lambda report: (
+                    timed_export(data, filtered_positions, export_format, progress=report)
+                ), tag=export_key)
+            export_task = task_progress("export")
+            if export_task is not None and export_task.future.exception() is not None:
+                st.error(f"Export failed: {export_task.future.exception()}")
+            elif export_task is not None:
+                export_file = export_task.result()
+                st.download_button(
+                    label="📥 Download Filtered Data",
+                    data=lambda: download_data(export_file),
+                    file_name=f"filtered_data.{export_extension}",
+                    mime=export_mime,
+                )
+    
+    resolve_pending_lotties()
+
+def render():
+    page_header(
+        "Data Explorer",
+        "Explore and filter the dataset with interactive controls"
+    )
+    
+    explorer()
@@ -0,0 +1,92 @@
+# Home page: welcome cards, KPI overview and the sales trend
+import streamlit as st
+import plotly.express as px
+from common import (
+    LOTTIE_DATA_URL, LIVE_INTERVAL, LIVE_MODE, animated_progress, start_task, cached_figure,
+    data_version, get_kpis, load_data, lottie_slot, plotly_chart, sales_trend, timed_fragment,
+)
+from cards import bullet_list, card, page_header, stat_card
+from progress import demo_work
+
+# Reruns on its own when the button is clicked
+@st.fragment
+@timed_fragment("animation_demo")
+def animation_demo():
+    if st.button("Show Animation Demo"):
+        start_task("animation_demo", demo_work)
+    animated_progress("animation_demo")
+
+# KPI cards and the Sales Trend; in live mode rerun every LIVE_INTERVAL
+# to pick up appended rows
+@st.fragment(run_every=LIVE_INTERVAL if LIVE_MODE else None)
+@timed_fragment("overview")
+def overview():
+    data = load_data()
+    kpis = get_kpis(data_version(data), data)
+
+    # Quick stats with animation
+    card("Dashboard Overview", transition=True)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        stat_card(f"$ {kpis['latest']['sales']:,.2f}", "Total Sales", "#ff6b6b")
+    
+    with col2:
+        stat_card(f"{kpis['latest']['customers']:,.0f}", "Total Customers", "#4ecdc4")
+    
+    with col3:
+        stat_card(str(kpis['distinct']['region']), "Regions", "#ffe66d")
+    
+    with col4:
+        stat_card(str(kpis['distinct']['category']), "Categories", "#6a0572")
+    
+    # Sample chart
+    card("Sales Trend", transition=True)
+    
+    def build_sales_trend():
+        fig = px.line(
+            sales_trend(data), 
+            x='date', 
+            y='sales',
+            title=None,
+            template='plotly_white' if st.session_state.theme == "light" else 'plotly_dark'
+        )
+    
+        fig.update_layout(
+            height=400,
+            margin=dict(l=20, r=20, t=30, b=20),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            xaxis_title="Date",
+            yaxis_title="Sales",
+        )
+        return fig
+    
+    fig = cached_figure(data, ("sales_trend", st.session_state.theme), build_sales_trend)
+    plotly_chart(fig)
+
+def render():
+    page_header(
+        "Welcome to the Interactive Dashboard",
+        "This dashboard demonstrates various animations and interactive elements in Streamlit."
+    )
+    
+    # Display Lottie animation
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        card("Features", bullet_list((
+            "Animated page transitions and elements",
+            "Light and dark theme switching",
+            "Interactive data visualizations",
+            "Scroll animations and hover effects",
+            "Responsive layout design",
+        )))
+        
+        animation_demo()
+    
+    with col2:
+        lottie_slot(LOTTIE_DATA_URL, 300, "hello", "https://via.placeholder.com/300x200?text=Animation")
+    
+    overview()
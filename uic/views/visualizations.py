@@ -0,0 +1,200 @@
+# Visualizations page: configurable chart and the sales distribution
+import streamlit as st
+import plotly.express as px
+from common import (
+    CHART_POINT_BUDGETS, DISTRIBUTION_MODE, LINE_DOWNSAMPLE_METHOD, cached_figure, data_version,
+    date_range_input, get_agg_cube, get_distribution_stats, get_rollups, load_data, plotly_chart, time_series,
+    timed_fragment,
+)
+from metrics import span
+from cards import card, page_header
+from downsample import downsample_frame, sample_points, scatter_render_mode
+from summary_stats import histogram_figure, box_figure
+
+# Chart settings and chart rerun on their own when a setting changes
+@st.fragment
+@timed_fragment("chart_panel")
+def chart_panel():
+    data = load_data()
+    agg_cube = get_agg_cube(data_version(data), data)
+    
+    # Visualization selector with animation
+    viz_type = st.selectbox(
+        "Select Visualization Type",
+        ["Line Chart", "Bar Chart", "Scatter Plot", "Pie Chart", "Heatmap"]
+    )
+    
+    col1, col2 = st.columns([3, 1])
+    
+    with col2:
+        card("Chart Settings")
+        
+        if viz_type != "Pie Chart" and viz_type != "Heatmap":
+            x_axis = st.selectbox("X-axis", ["date", "region", "category"])
+            y_axis = st.selectbox("Y-axis", ["sales", "customers"], index=0)
+            color_by = st.selectbox("Color by", ["None", "region", "category"], index=0)
+        
+        # Line and bar charts over time draw the rollup tier that fits the range
+        date_range = None
+        if viz_type in ("Line Chart", "Bar Chart") and x_axis == "date":
+            date_range = tuple(date_range_input(
+                "Date range", "viz_date_range", get_rollups(data_version(data), data).date_bounds()
+            ))
+        
+        if viz_type == "Pie Chart":
+            pie_metric = st.selectbox("Metric", ["sales", "customers"], index=0)
+            group_by = st.selectbox("Group by", ["region", "category"], index=0)
+        
+        if viz_type == "Heatmap":
+            heatmap_x = st.selectbox("X-axis", ["region", "category"], index=0)
+            heatmap_y = st.selectbox("Y-axis", ["category", "region"], index=1)
+            agg_func = st.selectbox("Aggregate function", ["mean", "sum", "count"], index=1)
+            heatmap_value = st.selectbox("Value", ["sales", "customers"], index=0)
+    
+    with col1:
+        card(viz_type)
+        
+        # Create visualization based on selection
+        if viz_type == "Line Chart":
+            color_param = None if color_by == "None" else color_by
+            def build_line_chart():
+                chart_data = data if date_range is None else time_series(data, y_axis, color_param, date_range)[1]
+                fig = px.line(
+                    downsample_frame(chart_data, x_axis, y_axis, CHART_POINT_BUDGETS["line"], LINE_DOWNSAMPLE_METHOD, color=color_param), 
+                    x=x_axis, 
+                    y=y_axis,
+                    color=color_param,
+                    template='plotly_white' if st.session_state.theme == "light" else 'plotly_dark'
+                )
+                return fig
+            
+            fig = cached_figure(data, (viz_type, x_axis, y_axis, color_by, date_range, st.session_state.theme), build_line_chart)
+            plotly_chart(fig)
+            
+        elif viz_type == "Bar Chart":
+            color_param = None if color_by == "None" else color_by
+            def build_bar_chart():
+                fig = px.bar(
+                    data if date_range is None else time_series(data, y_axis, color_param, date_range)[1], 
+                    x=x_axis, 
+                    y=y_axis,
+                    color=color_param,
+                    template='plotly_white' if st.session_state.theme == "light" else 'plotly_dark'
+                )
+                return fig
+            
+            fig = cached_figure(data, (viz_type, x_axis, y_axis, color_by, date_range, st.session_state.theme), build_bar_chart)
+            plotly_chart(fig)
+            
+        elif viz_type == "Scatter Plot":
+            color_param = None if color_by == "None" else color_by
+            def build_scatter_plot():
+                scatter_data = sample_points(data, CHART_POINT_BUDGETS["scatter"])
+                fig = px.scatter(
+                    scatter_data, 
+                    x=x_axis, 
+                    y=y_axis,
+                    color=color_param,
+                    size_max=15,
+                    opacity=0.7,
+                    render_mode=scatter_render_mode(len(scatter_data)),
+                    template='plotly_white' if st.session_state.theme == "light" else 'plotly_dark'
+                )
+                return fig
+            
+            fig = cached_figure(data, (viz_type, x_axis, y_axis, color_by, st.session_state.theme), build_scatter_plot)
+            plotly_chart(fig)
+            
+        elif viz_type == "Pie Chart":
+            def build_pie_chart():
+                grouped_data = agg_cube.total(group_by, pie_metric, "sum").reset_index()
+                fig = px.pie(
+                    grouped_data, 
+                    values=pie_metric, 
+                    names=group_by,
+                    hole=0.4,
+                    template='plotly_white' if st.session_state.theme == "light" else 'plotly_dark'
+                )
+                return fig
+            
+            fig = cached_figure(data, (viz_type, group_by, pie_metric, st.session_state.theme), build_pie_chart)
+            plotly_chart(fig)
+            
+        elif viz_type == "Heatmap":
+            def build_heatmap():
+                with span("pivot"):
+                    pivot_data = agg_cube.pivot(heatmap_y, heatmap_x, heatmap_value, agg_func)
+            
+                fig = px.imshow(
+                    pivot_data,
+                    text_auto=True,
+                    aspect="auto",
+                    color_continuous_scale='Blues' if st.session_state.theme == "light" else 'Viridis',
+                    template='plotly_white' if st.session_state.theme == "light" else 'plotly_dark'
+                )
+                fig.update_layout(height=500)
+                return fig
+            
+            fig = cached_figure(data, (viz_type, heatmap_x, heatmap_y, agg_func, heatmap_value, st.session_state.theme), build_heatmap)
+            plotly_chart(fig)
+
+def render():
+    data = load_data()
+    page_header(
+        "Interactive Visualizations",
+        "Explore the data through various chart types and visualizations"
+    )
+    
+    chart_panel()
+    
+    # Additional interactive elements
+    card("Sales Distribution")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        def build_sales_histogram():
+            if DISTRIBUTION_MODE == "summary":
+                edges, counts = get_distribution_stats(data_version(data), data)["histogram"]
+                fig = histogram_figure(
+                    edges,
+                    counts,
+                    'sales',
+                    template='plotly_white' if st.session_state.theme == "light" else 'plotly_dark'
+                )
+            else:
+                fig = px.histogram(
+                    data, 
+                    x='sales',
+                    nbins=20,
+                    opacity=0.7,
+                    template='plotly_white' if st.session_state.theme == "light" else 'plotly_dark'
+                )
+            fig.update_layout(height=300)
+            return fig
+        
+        fig = cached_figure(data, ("sales_histogram", DISTRIBUTION_MODE, st.session_state.theme), build_sales_histogram)
+        plotly_chart(fig)
+    
+    with col2:
+        def build_sales_box():
+            if DISTRIBUTION_MODE == "summary":
+                fig = box_figure(
+                    get_distribution_stats(data_version(data), data)["box"],
+                    'region',
+                    'sales',
+                    template='plotly_white' if st.session_state.theme == "light" else 'plotly_dark'
+                )
+            else:
+                fig = px.box(
+                    data, 
+                    x='region', 
+                    y='sales',
+                    color='region',
+                    template='plotly_white' if st.session_state.theme == "light" else 'plotly_dark'
+                )
+            fig.update_layout(height=300)
+            return fig
+        
+        fig = cached_figure(data, ("sales_box", DISTRIBUTION_MODE, st.session_state.theme), build_sales_box)
+        plotly_chart(fig)